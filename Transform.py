@@ -1,31 +1,31 @@
 import pandas as pd
+import numpy as np
 import re
+import os
+import argparse
+import importlib.util
+import json
+import time
+import copy
+import hashlib
+import sqlite3
+import multiprocessing
+import tempfile
+import shutil
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-import requests
 
 # ==============================
 # SASTRAWI IMPORT & SETUP
 # ==============================
-try:
-    from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
-    from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
-    
-    # Initialize Sastrawi components
-    stemmer_factory = StemmerFactory()
-    stemmer = stemmer_factory.create_stemmer()
-    
-    stopword_factory = StopWordRemoverFactory()
-    stopword_remover = stopword_factory.create_stop_word_remover()
-    sastrawi_stopwords = stopword_factory.get_stop_words()
-    
-    SASTRAWI_AVAILABLE = True
-    print("✅ Sastrawi successfully imported and initialized")
-except ImportError:
-    print("⚠️ Sastrawi not available. Install with: pip install Sastrawi")
-    SASTRAWI_AVAILABLE = False
-    stemmer = None
-    stopword_remover = None
-    sastrawi_stopwords = set()
+# Sastrawi baru di-load saat pertama kali dipakai (lihat init_sastrawi),
+# supaya import modul ini tetap ringan untuk worker dan test
+SASTRAWI_AVAILABLE = importlib.util.find_spec("Sastrawi") is not None
+stemmer = None
+stopword_remover = None
+sastrawi_stopwords = set()
+_SASTRAWI_INITIALIZED = False
 
 # ==============================
 # KONFIGURASI
@@ -57,9 +57,111 @@ CONFIG = {
             "banget", "bgt", "gak", "ga", "nggak", "engga"
         ]
     },
-    "enable_logging": True
+    "enable_logging": True,
+    # Direktori cache lokal (stopwords, dll.) yang dipakai ulang antar run.
+    # None = <output dir>/.transform_cache di run_transform, selain itu DEFAULT_CACHE_DIR; "" = tanpa cache
+    "cache_dir": None,
+    "stopword_cache_max_age_hours": 24,
+    # Jumlah maksimum token -> stem yang disimpan di memori (LRU)
+    "stem_cache_max_items": 50000,
+    # Cleaning teks paralel (multi-core) untuk kolom teks yang besar
+    "parallel": {
+        "enabled": False,
+        "workers": None,  # None = jumlah CPU
+        "chunk_size": 500
+    },
+    # Proses platform (baca, join, preprocessing) bersamaan di beberapa proses
+    # (opt-in lewat --platform-workers: fork pool tidak cocok untuk semua lingkungan notebook)
+    "concurrent_platforms": {
+        "enabled": False,
+        "workers": None  # None = min(jumlah CPU, jumlah platform)
+    },
+    # Incremental: hanya proses baris baru/berubah sejak run terakhir
+    "incremental": {
+        "enabled": False
+    },
+    # Cache hasil cleaning per teks unik (hash teks mentah + fingerprint preprocessing)
+    "cleaned_text_cache": True,
+    # Teks hasil cleaning yang tidak dipakai selama N hari dihapus dari cache
+    "cleaned_text_cache_max_age_days": 30,
+    # Streaming: baca CSV per chunk dan tulis output bertahap, memori tidak tumbuh dengan ukuran input
+    "streaming": {
+        "enabled": False,
+        "chunksize": 20000
+    },
+    # Dataset Parquet (partisi platform/tanggal, bertipe, terkompresi) di samping CSV; butuh pyarrow
+    "parquet": {
+        "enabled": False,
+        "compression": "zstd",
+        # Granularitas partisi tanggal: per bulan ("%Y-%m") atau per hari ("%Y-%m-%d")
+        "date_partition_format": "%Y-%m"
+    },
+    # Kolom token list (+ id integer dari vocabulary bersama) di frame dashboard
+    "tokens": {
+        "enabled": False,
+        "token_ids": False
+    },
+    # Representasi hemat memori untuk frame dashboard gabungan (dan output yang dikembalikan)
+    "compact": {
+        "enabled": False,
+        "keep_content_original": True,
+        # Kolom jadi category hanya kalau jumlah nilai unik <= rasio ini * jumlah baris
+        "category_max_ratio": 0.5
+    },
+    # Deteksi near-duplicate (MinHash LSH) setelah dedup teks persis
+    "near_duplicates": {
+        "enabled": False,
+        # "drop": simpan satu baris per cluster, "tag": isi kolom near_duplicate_cluster
+        "mode": "drop",
+        # Estimasi Jaccard minimum (shingle kata) untuk dianggap near-duplicate
+        "threshold": 0.8,
+        "num_perm": 128,
+        "shingle_size": 2,
+        "seed": 1
+    },
+    # dashboardsna tanpa teks post: relasi merujuk ke dashboardsentimen lewat post_url
+    "normalized_sna": {
+        "enabled": False
+    },
+    # Statistik teks sentimen (rata-rata kata, reduksi, stopword, contoh) untuk laporan
+    "preprocessing_stats": {
+        # Ukuran sampel contoh (juga dipakai untuk estimasi stopword yang paling sering dibuang)
+        "sample_size": 1000,
+        "top_stopwords": 10
+    },
+    # Waktu & jumlah panggilan per langkah preprocessing + token yang dibuang per tahap
+    "profile": {
+        "enabled": False
+    }
 }
 
+STOPWORD_URL = "https://raw.githubusercontent.com/rizqi-maulidi/UAS-Deep-Learning/main/kamusstopword.txt"
+STOPWORD_CACHE_VERSION = 1
+DEFAULT_STOPWORDS = {"dan","yang","di","ke","dari","untuk","pada","dengan","sebagai","atau","juga","karena","ada","tidak","ini","itu","adalah","akan","atau","bisa","dapat","harus","jika","kalau","karena","ketika","maka","namun","oleh","sampai","sangat","satu","seperti","setiap","sudah","tanpa","telah","untuk","yang","yaitu"}
+
+# Stopword set per fingerprint konfigurasi, dibangun sekali per proses
+_STOPWORD_REGISTRY = {}
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "transform")
+
+STEM_CACHE_VERSION = 1
+_STEM_CACHE = None
+_CLEAN_TEXT_CACHE = None
+
+# Konfigurasi preprocessing di dalam worker process (diisi oleh initializer)
+_WORKER_CONFIG = None
+
+# TextCleaner yang sudah di-compile, per objek config
+_TEXT_CLEANERS = {}
+
+# PreprocessingProfile yang sedang aktif (None kalau profiling mati)
+_PROFILE = None
+
+# PreprocessingStats run yang sedang berjalan
+_STATS = None
+
+MANIFEST_VERSION = 1
+
 # ==============================
 # HELPER FUNCTIONS
 # ==============================
@@ -67,18 +169,110 @@ def log_activity(msg):
     if CONFIG["enable_logging"]:
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {msg}")
 
+def init_sastrawi():
+    """Initialize the Sastrawi stemmer and stopword list on first use"""
+    global SASTRAWI_AVAILABLE, stemmer, stopword_remover, sastrawi_stopwords, _SASTRAWI_INITIALIZED
+    if _SASTRAWI_INITIALIZED or not SASTRAWI_AVAILABLE:
+        return SASTRAWI_AVAILABLE
+    _SASTRAWI_INITIALIZED = True
+
+    try:
+        from Sastrawi.Dictionary.ArrayDictionary import ArrayDictionary
+        from Sastrawi.Stemmer.Stemmer import Stemmer
+        from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+        from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
+
+        # Initialize Sastrawi components. Tanpa CachedStemmer bawaan Sastrawi:
+        # StemCache adalah satu-satunya cache stem
+        stemmer = Stemmer(ArrayDictionary(StemmerFactory().get_words()))
+
+        stopword_factory = StopWordRemoverFactory()
+        stopword_remover = stopword_factory.create_stop_word_remover()
+        sastrawi_stopwords = stopword_factory.get_stop_words()
+
+        log_activity("✅ Sastrawi successfully imported and initialized")
+    except ImportError:
+        log_activity("⚠️ Sastrawi not available. Install with: pip install Sastrawi")
+        SASTRAWI_AVAILABLE = False
+    return SASTRAWI_AVAILABLE
+
+def get_cache_path(filename):
+    """Path file di direktori cache, None kalau cache dimatikan (direktori belum dibuat di sini)"""
+    cache_dir = CONFIG.get("cache_dir")
+    if cache_dir is None:
+        cache_dir = DEFAULT_CACHE_DIR
+    if not cache_dir:
+        return None
+    return os.path.join(cache_dir, filename)
+
+def ensure_cache_dir(path):
+    """Create the directory of a cache file right before it is first written; False if that fails"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return True
+    except OSError as e:
+        log_activity(f"⚠️ Cache directory unavailable: {e}")
+        return False
+
+def config_fingerprint(obj):
+    """Stable short hash of a JSON-serializable config object"""
+    payload = json.dumps(obj, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+def _load_stopword_cache(path):
+    """Read the on-disk stopword cache, None if missing, corrupt or from another version/URL"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("version") != STOPWORD_CACHE_VERSION or cached.get("url") != STOPWORD_URL:
+        return None
+    return cached
+
+def _save_stopword_cache(path, words):
+    """Write the stopword cache atomically so a crashed run never leaves a half-written file"""
+    if not ensure_cache_dir(path):
+        return
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": STOPWORD_CACHE_VERSION,
+                "url": STOPWORD_URL,
+                "fetched_at": time.time(),
+                "words": sorted(words)
+            }, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        log_activity(f"⚠️ Could not write stopword cache: {e}")
+
 def get_indonesian_stopwords():
-    """Get Indonesian stopwords from multiple sources"""
+    """Get Indonesian stopwords, served from the on-disk cache while it is fresh"""
+    cache_path = get_cache_path("stopwords.json")
+    cached = _load_stopword_cache(cache_path) if cache_path else None
+    max_age = CONFIG["stopword_cache_max_age_hours"] * 3600
+
+    if cached and time.time() - cached["fetched_at"] < max_age:
+        log_activity(f"📦 Loaded {len(cached['words'])} cached online stopwords")
+        return set(cached["words"])
+
     try:
-        url = "https://raw.githubusercontent.com/rizqi-maulidi/UAS-Deep-Learning/main/kamusstopword.txt"
-        resp = requests.get(url, timeout=10)
+        import requests
+        resp = requests.get(STOPWORD_URL, timeout=10)
         resp.raise_for_status()
         online_stopwords = set(line.strip().lower() for line in resp.text.splitlines() if line.strip())
         log_activity(f"📥 Downloaded {len(online_stopwords)} online stopwords")
+        if cache_path:
+            _save_stopword_cache(cache_path, online_stopwords)
         return online_stopwords
     except Exception as e:
+        # Offline: cache lama tetap lebih baik daripada daftar default
+        if cached:
+            log_activity(f"⚠️ Using stale cached stopwords: {e}")
+            return set(cached["words"])
         log_activity(f"⚠️ Using default stopwords: {e}")
-        return {"dan","yang","di","ke","dari","untuk","pada","dengan","sebagai","atau","juga","karena","ada","tidak","ini","itu","adalah","akan","atau","bisa","dapat","harus","jika","kalau","karena","ketika","maka","namun","oleh","sampai","sangat","satu","seperti","setiap","sudah","tanpa","telah","untuk","yang","yaitu"}
+        return set(DEFAULT_STOPWORDS)
 
 def get_combined_stopwords(config):
     """Combine all stopwords from different sources"""
@@ -90,7 +284,7 @@ def get_combined_stopwords(config):
         log_activity(f"➕ Added {len(config['custom_stopwords'])} custom stopwords")
     
     # Add Sastrawi stopwords if available and enabled
-    if config["use_sastrawi_stopwords"] and SASTRAWI_AVAILABLE:
+    if config["use_sastrawi_stopwords"] and init_sastrawi():
         all_stopwords.update(sastrawi_stopwords)
         log_activity(f"➕ Added {len(sastrawi_stopwords)} Sastrawi stopwords")
     
@@ -103,125 +297,1099 @@ def get_combined_stopwords(config):
     log_activity(f"🔗 Total combined stopwords: {len(all_stopwords)}")
     return all_stopwords
 
+def get_stopword_registry(config=None):
+    """Frozen combined stopword set, built once per process for each stopword config"""
+    if config is None:
+        config = CONFIG["text_preprocessing"]
+
+    fingerprint = config_fingerprint({
+        "custom_stopwords": config["custom_stopwords"],
+        "use_sastrawi_stopwords": config["use_sastrawi_stopwords"] and SASTRAWI_AVAILABLE,
+        "combine_stopwords": config["combine_stopwords"]
+    })
+    stopwords = _STOPWORD_REGISTRY.get(fingerprint)
+    if stopwords is None:
+        stopwords = frozenset(get_combined_stopwords(config))
+        _STOPWORD_REGISTRY[fingerprint] = stopwords
+    return stopwords
+
+def preprocessing_fingerprint(config=None):
+    """Fingerprint of everything that decides the cleaned text: config, stemmer and stopword set"""
+    if config is None:
+        config = CONFIG["text_preprocessing"]
+    stopwords = sorted(get_stopword_registry(config)) if config["remove_stopwords"] else None
+    return config_fingerprint({
+        "config": config,
+        "sastrawi": SASTRAWI_AVAILABLE,
+        "stopwords": config_fingerprint(stopwords)
+    })
+
+class StemCache:
+    """Token -> stem cache: an in-memory LRU in front of a persistent SQLite table.
+
+    Sastrawi stems every word independently, so caching per token gives the
+    same result as stemming the whole sentence while only unseen tokens
+    reach the (slow) dictionary lookups. TextCleaner memoizes whole token
+    plans in front of it and reports those lookups as memo_hits.
+    """
+
+    def __init__(self, path=None, max_memory_items=50000):
+        self.path = path
+        self.max_memory_items = max_memory_items
+        self._memory = OrderedDict()
+        self._pending = {}
+        self._conn = None
+        self._disk_in_memory = False
+        self.memo_hits = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        # File cache baru dibuat saat stem pertama ditulis (flush)
+        if path and os.path.exists(path):
+            self._open(path)
+
+    def _version_tag(self):
+        try:
+            from importlib.metadata import version
+            sastrawi_version = version("Sastrawi")
+        except Exception:
+            sastrawi_version = "unknown"
+        return f"{STEM_CACHE_VERSION}:{sastrawi_version}"
+
+    def _open(self, path):
+        try:
+            conn = sqlite3.connect(path, timeout=30)
+            # Ini cache, bukan data utama: tidak perlu fsync di setiap commit
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute("CREATE TABLE IF NOT EXISTS stems (token TEXT PRIMARY KEY, stem TEXT NOT NULL)")
+
+            # Stem dari versi Sastrawi/cache lain tidak dipakai ulang
+            version_tag = self._version_tag()
+            row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != version_tag:
+                conn.execute("DELETE FROM stems")
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (version_tag,))
+                conn.commit()
+
+            # Kosakata korpus kecil, jadi langsung isi LRU dari disk
+            rows = conn.execute("SELECT token, stem FROM stems LIMIT ?", (self.max_memory_items + 1,)).fetchall()
+            self._memory.update(rows[:self.max_memory_items])
+            self._disk_in_memory = len(rows) <= self.max_memory_items
+            self._conn = conn
+        except sqlite3.Error as e:
+            log_activity(f"⚠️ Stem cache on disk disabled: {e}")
+            self._conn = None
+
+    def _lookup_disk(self, token):
+        if self._conn is None or self._disk_in_memory:
+            return None
+        row = self._conn.execute("SELECT stem FROM stems WHERE token = ?", (token,)).fetchone()
+        return row[0] if row else None
+
+    def _remember(self, token, stem):
+        self._memory[token] = stem
+        if len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+            # Sekarang ada stem di disk yang tidak ada di memori
+            self._disk_in_memory = False
+
+    def stem(self, token):
+        """Stem a single token, calling Sastrawi only on a cache miss"""
+        stem = self._memory.get(token)
+        if stem is not None:
+            self._memory.move_to_end(token)
+            self.hits += 1
+            return stem
+
+        stem = self._lookup_disk(token)
+        if stem is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            if stemmer is None:
+                init_sastrawi()
+            stem = stemmer.stem(token)
+            self._pending[token] = stem
+            if len(self._pending) >= 1000:
+                self.flush()
+
+        self._remember(token, stem)
+        return stem
+
+    def flush(self):
+        """Persist stems computed since the last flush"""
+        if self._conn is None and self._pending and self.path and ensure_cache_dir(self.path):
+            self._open(self.path)
+        if self._conn is None or not self._pending:
+            # Cache di disk tidak tersedia: jangan coba buka lagi di setiap flush
+            if self._conn is None:
+                self.path = None
+            self._pending.clear()
+            return
+        try:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO stems (token, stem) VALUES (?, ?)",
+                self._pending.items()
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            log_activity(f"⚠️ Could not write stem cache: {e}")
+        self._pending.clear()
+
+    def stats(self):
+        """Hit rate and size of the cache since it was opened"""
+        lookups = self.memo_hits + self.hits + self.disk_hits + self.misses
+        disk_size = None
+        if self._conn is not None:
+            disk_size = self._conn.execute("SELECT COUNT(*) FROM stems").fetchone()[0]
+        return {
+            "lookups": lookups,
+            "memo_hits": self.memo_hits,
+            "memory_hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memo_hits + self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_size": len(self._memory),
+            "disk_size": disk_size
+        }
+
+def get_stem_cache():
+    """Process-wide StemCache, opened on first use"""
+    global _STEM_CACHE
+    if _STEM_CACHE is None:
+        init_sastrawi()
+        _STEM_CACHE = StemCache(
+            path=get_cache_path("stem_cache.sqlite"),
+            max_memory_items=CONFIG["stem_cache_max_items"]
+        )
+    return _STEM_CACHE
+
+class CleanTextCache:
+    """Content-addressed cache: hash of the raw text -> cleaned text.
+
+    Rows are stored under the preprocessing fingerprint (config, stemmer and
+    stopword set), so a config change never reuses stale text and switching
+    back finds the old rows again. Rows unused for cleaned_text_cache_max_age_days
+    are evicted when the cache is opened.
+    """
+
+    def __init__(self, path, fingerprint):
+        self.path = path
+        self.fingerprint = fingerprint
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+        # File cache baru dibuat saat teks pertama ditulis (put_many)
+        if path and os.path.exists(path):
+            self._open(path)
+
+    def _open(self, path):
+        try:
+            conn = sqlite3.connect(path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cleaned ("
+                "fingerprint TEXT NOT NULL, text_hash TEXT NOT NULL, cleaned TEXT NOT NULL, "
+                "used_at REAL NOT NULL DEFAULT 0, PRIMARY KEY (fingerprint, text_hash))"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(cleaned)")}
+            if "used_at" not in columns:
+                # Cache versi lama tanpa waktu pakai: anggap baru dipakai
+                conn.execute("ALTER TABLE cleaned ADD COLUMN used_at REAL NOT NULL DEFAULT 0")
+                conn.execute("UPDATE cleaned SET used_at = ?", (time.time(),))
+
+            max_age = CONFIG["cleaned_text_cache_max_age_days"] * 86400
+            expired = conn.execute("DELETE FROM cleaned WHERE used_at < ?", (time.time() - max_age,)).rowcount
+            conn.commit()
+            if expired:
+                log_activity(f"♻️ Evicted {expired} cleaned texts unused for "
+                             f"{CONFIG['cleaned_text_cache_max_age_days']} days")
+            self._conn = conn
+        except sqlite3.Error as e:
+            log_activity(f"⚠️ Cleaned-text cache on disk disabled: {e}")
+            self._conn = None
+
+    @staticmethod
+    def text_hash(text):
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get_many(self, hashes):
+        """Cached cleaned texts for the given hashes, as a dict"""
+        found = {}
+        if self._conn is not None:
+            # Batasi jumlah parameter per query SQLite
+            for i in range(0, len(hashes), 500):
+                batch = hashes[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, cleaned FROM cleaned WHERE fingerprint = ? AND text_hash IN ({placeholders})",
+                    [self.fingerprint, *batch]
+                ).fetchall()
+                found.update(rows)
+                if rows:
+                    self._conn.execute(
+                        f"UPDATE cleaned SET used_at = ? WHERE fingerprint = ? AND text_hash IN "
+                        f"({','.join('?' * len(rows))})",
+                        [time.time(), self.fingerprint, *(h for h, _ in rows)]
+                    )
+            if found:
+                self._conn.commit()
+        self.hits += len(found)
+        self.misses += len(hashes) - len(found)
+        return found
+
+    def put_many(self, items):
+        """Store (text_hash, cleaned) pairs"""
+        if not items:
+            return
+        if self._conn is None and self.path and ensure_cache_dir(self.path):
+            self._open(self.path)
+        if self._conn is None:
+            self.path = None
+            return
+        try:
+            now = time.time()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cleaned (fingerprint, text_hash, cleaned, used_at) VALUES (?, ?, ?, ?)",
+                [(self.fingerprint, h, cleaned, now) for h, cleaned in items]
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            log_activity(f"⚠️ Could not write cleaned-text cache: {e}")
+
+def get_clean_text_cache(config=None):
+    """CleanTextCache for the current preprocessing fingerprint, opened on first use"""
+    global _CLEAN_TEXT_CACHE
+    fingerprint = preprocessing_fingerprint(config)
+    if _CLEAN_TEXT_CACHE is None or _CLEAN_TEXT_CACHE.fingerprint != fingerprint:
+        _CLEAN_TEXT_CACHE = CleanTextCache(get_cache_path("clean_cache.sqlite"), fingerprint)
+    return _CLEAN_TEXT_CACHE
+
+# ==============================
+# PREPROCESSING PROFILE
+# ==============================
+class PreprocessingProfile:
+    """Wall time, call and item counts per preprocessing step, plus token/row counters.
+
+    Steps from worker processes are merged in, so their seconds add up CPU
+    time across workers rather than wall time of the whole run.
+    """
+
+    def __init__(self):
+        self.steps = {}
+        self.counters = Counter()
+
+    def add(self, step, seconds, items=0):
+        entry = self.steps.get(step)
+        if entry is None:
+            entry = self.steps[step] = [0.0, 0, 0]
+        entry[0] += seconds
+        entry[1] += 1
+        entry[2] += items
+
+    def count(self, name, value=1):
+        self.counters[name] += value
+
+    def merge(self, data):
+        """Add a profile collected elsewhere (the to_dict() of a worker's profile)"""
+        for step, entry in data["steps"].items():
+            current = self.steps.setdefault(step, [0.0, 0, 0])
+            current[0] += entry["seconds"]
+            current[1] += entry["calls"]
+            current[2] += entry["items"]
+        self.counters.update(data["counters"])
+
+    def to_dict(self):
+        return {
+            "steps": {
+                step: {"seconds": seconds, "calls": calls, "items": items}
+                for step, (seconds, calls, items) in self.steps.items()
+            },
+            "counters": dict(self.counters)
+        }
+
+def get_profile():
+    """Active PreprocessingProfile, or None when profiling is disabled"""
+    global _PROFILE
+    if not CONFIG["profile"]["enabled"]:
+        return None
+    if _PROFILE is None:
+        _PROFILE = PreprocessingProfile()
+    return _PROFILE
+
+def reset_profile():
+    """Start a fresh profile (called at the start of each run)"""
+    global _PROFILE
+    _PROFILE = None
+    return get_profile()
+
+def _take_worker_profile():
+    """Profile collected in this worker since the last call, as a dict (None when disabled)"""
+    global _PROFILE
+    profile, _PROFILE = _PROFILE, None
+    return profile.to_dict() if profile is not None else None
+
+def merge_worker_profile(data):
+    """Merge a worker's _take_worker_profile() result into the active profile"""
+    profile = get_profile()
+    if data and profile is not None:
+        profile.merge(data)
+
+def profiled_call(step, func, *args, items=0, **kwargs):
+    """func(*args, **kwargs), timed under `step` when profiling is enabled"""
+    profile = get_profile()
+    if profile is None:
+        return func(*args, **kwargs)
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    profile.add(step, time.perf_counter() - start, items)
+    return result
+
+def save_preprocessing_profile(profile, path):
+    """Write the profile as a JSON sidecar of preprocessing_report.csv and log the slowest steps"""
+    data = profile.to_dict()
+    steps = sorted(data["steps"].items(), key=lambda item: item[1]["seconds"], reverse=True)
+    report = {
+        "created_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "steps": {step: {**entry, "seconds": round(entry["seconds"], 6)} for step, entry in steps},
+        "counters": data["counters"]
+    }
+    if SASTRAWI_AVAILABLE and CONFIG["text_preprocessing"]["use_sastrawi_stemming"]:
+        report["stem_cache"] = get_stem_cache().stats()
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    log_activity("⏱️ Slowest preprocessing steps:")
+    for step, entry in steps[:5]:
+        log_activity(f"   - {step}: {entry['seconds']:.3f}s ({entry['calls']} calls)")
+    log_activity(f"   📊 {os.path.basename(path)} - Per-step timings and token counters")
+
 def apply_sastrawi_stemming(text):
-    """Apply Sastrawi stemming to text"""
+    """Apply Sastrawi stemming to text, token by token through the stem cache"""
     if not SASTRAWI_AVAILABLE or not text or pd.isna(text):
         return text
     
     try:
-        # Stemming dengan Sastrawi
-        stemmed = stemmer.stem(text)
-        return stemmed
+        # Stemming dengan Sastrawi (per token, lewat cache)
+        stem_cache = get_stem_cache()
+        stems = [stem_cache.stem(w) for w in text.split()]
+        return ' '.join(s for s in stems if s)
     except Exception as e:
         log_activity(f"⚠️ Stemming error: {e}")
         return text
 
-def clean_text_advanced(text, config=None):
-    """Advanced text preprocessing with Sastrawi integration"""
-    if pd.isna(text) or text == '' or not isinstance(text, str):
-        return ''
-
+class TextCleaner:
+    """clean_text_advanced compiled once from a text_preprocessing config.
+
+    The regex steps become precompiled patterns. The whitespace passes are
+    dropped because every result is re-joined from split() tokens anyway.
+    Length filtering, stemming, stopword and duplicate removal then run in
+    one pass over the tokens.
+    """
+
+    REGEX_STEPS = [
+        ("remove_urls", r'http\S+|www\.\S+', ''),
+        ("remove_mentions", r'@\w+', ''),
+        ("remove_hashtags", r'#\w+', ''),
+        ("remove_punctuation", r'[^\w\s#@]', ' '),
+        ("remove_numbers", r'\d+', ''),
+        ("remove_single_chars", r'\b\w\b', '')
+    ]
+
+    def __init__(self, config):
+        self.config = copy.deepcopy(config)
+        self.enabled = config["enabled"]
+        self.lowercase = config["lowercase"]
+
+        # Urutan pattern sama dengan urutan langkah di clean_text_advanced versi lama
+        self.patterns = []
+        self.pattern_steps = []
+        for step, regex, replacement in self.REGEX_STEPS:
+            if config[step]:
+                self.patterns.append((re.compile(regex), replacement))
+                self.pattern_steps.append(step)
+
+        self.min_word_length = config["min_word_length"]
+        self.stem = config["use_sastrawi_stemming"] and SASTRAWI_AVAILABLE
+        self.stopwords = get_stopword_registry(config) if config["remove_stopwords"] else None
+        self.remove_duplicates = config["remove_duplicate_words"]
+
+        # Hasil per token bersifat deterministik, jadi cukup dihitung sekali
+        self._token_memo = {}
+        # Versi profiling: plan + jumlah token yang dibuang tiap tahap
+        self._profile_memo = {}
+        self.memo_max_items = CONFIG["stem_cache_max_items"]
+
+    def _apply_patterns(self, text):
+        t = text.lower() if self.lowercase else text
+        for pattern, replacement in self.patterns:
+            t = pattern.sub(replacement, t)
+        return t
+
+    def _token_plan(self, word):
+        """Final (word, dedup key) pairs for one raw token: length filter, stem, stopwords"""
+        if len(word) < self.min_word_length:
+            return ()
+        # Stem Sastrawi bisa kosong atau lebih dari satu kata
+        words = get_stem_cache().stem(word).split() if self.stem else (word,)
+        stopwords = self.stopwords
+        return tuple(
+            (w, w.lower()) for w in words
+            if stopwords is None or w.lower() not in stopwords
+        )
+
+    def _filter_tokens(self, t):
+        """Single tokenize-filter pass over the regex-cleaned text"""
+        memo = self._token_memo
+        seen = set() if self.remove_duplicates else None
+
+        tokens = []
+        memo_hits = 0
+        for word in t.split():
+            plan = memo.get(word)
+            if plan is None:
+                plan = self._token_plan(word)
+                if len(memo) >= self.memo_max_items:
+                    memo.clear()
+                memo[word] = plan
+            elif self.stem and len(word) >= self.min_word_length:
+                memo_hits += 1
+            for w, key in plan:
+                if seen is not None:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                tokens.append(w)
+        if memo_hits:
+            # Lookup stem yang dijawab memo dihitung di statistik StemCache
+            get_stem_cache().memo_hits += memo_hits
+        return tokens
+
+    def _token_plan_profiled(self, word, profile):
+        """_token_plan with stemming/stopword time and (length, stemming, stopword) token losses"""
+        if len(word) < self.min_word_length:
+            return (), (1, 0, 0)
+        if self.stem:
+            start = time.perf_counter()
+            words = get_stem_cache().stem(word).split()
+            profile.add("tokens:stem", time.perf_counter() - start)
+        else:
+            words = (word,)
+        start = time.perf_counter()
+        stopwords = self.stopwords
+        plan = tuple(
+            (w, w.lower()) for w in words
+            if stopwords is None or w.lower() not in stopwords
+        )
+        profile.add("tokens:stopwords", time.perf_counter() - start)
+        return plan, (0, 1 - len(words), len(words) - len(plan))
+
+    def _filter_tokens_profiled(self, t, profile):
+        """_filter_tokens that also counts the tokens removed by each stage"""
+        memo = self._profile_memo
+        seen = set() if self.remove_duplicates else None
+
+        tokens = []
+        words = t.split()
+        by_length = by_stemming = by_stopwords = duplicates = 0
+        memo_hits = 0
+        for word in words:
+            entry = memo.get(word)
+            if entry is None:
+                entry = self._token_plan_profiled(word, profile)
+                if len(memo) >= self.memo_max_items:
+                    memo.clear()
+                memo[word] = entry
+            elif self.stem and len(word) >= self.min_word_length:
+                memo_hits += 1
+            plan, (length_removed, stem_removed, stopword_removed) = entry
+            by_length += length_removed
+            by_stemming += stem_removed
+            by_stopwords += stopword_removed
+            for w, key in plan:
+                if seen is not None:
+                    if key in seen:
+                        duplicates += 1
+                        continue
+                    seen.add(key)
+                tokens.append(w)
+
+        counters = profile.counters
+        counters["tokens_after_regex"] += len(words)
+        counters["tokens_removed_min_length"] += by_length
+        # Bisa negatif kalau hasil stem lebih dari satu kata
+        counters["tokens_removed_stemming"] += by_stemming
+        counters["tokens_removed_stopwords"] += by_stopwords
+        counters["tokens_removed_duplicates"] += duplicates
+        counters["tokens_out"] += len(tokens)
+        if memo_hits:
+            get_stem_cache().memo_hits += memo_hits
+        return tokens
+
+    def _clean_profiled(self, text, profile):
+        """clean() with every regex step and the token pass timed"""
+        profile.count("tokens_in", len(text.split()))
+        t = text.lower() if self.lowercase else text
+        for step, (pattern, replacement) in zip(self.pattern_steps, self.patterns):
+            start = time.perf_counter()
+            t = pattern.sub(replacement, t)
+            profile.add(f"clean:{step}", time.perf_counter() - start, items=1)
+
+        start = time.perf_counter()
+        tokens = self._filter_tokens_profiled(t, profile)
+        profile.add("clean:tokens", time.perf_counter() - start, items=1)
+        if len(tokens) < 2:
+            profile.count("texts_cleaned_empty")
+            return '[cleaned_empty]'
+        return ' '.join(tokens)
+
+    def removed_stopwords(self, text):
+        """Stopwords the token pass drops from a text (for statistics, not the hot path)"""
+        if self.stopwords is None or pd.isna(text) or not isinstance(text, str):
+            return []
+        removed = []
+        for word in self._apply_patterns(text).split():
+            if len(word) < self.min_word_length:
+                continue
+            words = get_stem_cache().stem(word).split() if self.stem else (word,)
+            removed.extend(w.lower() for w in words if w.lower() in self.stopwords)
+        return removed
+
+    def clean(self, text):
+        """Clean a single text (same contract as clean_text_advanced)"""
+        if pd.isna(text) or text == '' or not isinstance(text, str):
+            return ''
+        if not self.enabled:
+            return text
+
+        profile = get_profile()
+        if profile is not None:
+            return self._clean_profiled(text, profile)
+
+        tokens = self._filter_tokens(self._apply_patterns(text))
+        # Return cleaned text or mark as empty if too short
+        return ' '.join(tokens) if len(tokens) >= 2 else '[cleaned_empty]'
+
+    def clean_series(self, series):
+        """Batch path for a whole column: regex steps via Series.str, then the token pass"""
+        is_text = series.map(lambda x: isinstance(x, str) and x != '')
+        cleaned = pd.Series('', index=series.index, dtype=object, name=series.name)
+        if not is_text.any():
+            return cleaned
+
+        texts = series[is_text]
+        if not self.enabled:
+            cleaned[is_text] = texts
+            return cleaned
+
+        profile = get_profile()
+        if profile is not None:
+            profile.count("tokens_in", int(texts.str.split().str.len().sum()))
+
+        if self.lowercase:
+            texts = texts.str.lower()
+        for step, (pattern, replacement) in zip(self.pattern_steps, self.patterns):
+            start = time.perf_counter()
+            texts = texts.str.replace(pattern, replacement, regex=True)
+            if profile is not None:
+                profile.add(f"clean:{step}", time.perf_counter() - start, items=len(texts))
+
+        start = time.perf_counter()
+        filter_tokens = self._filter_tokens if profile is None else (
+            lambda t: self._filter_tokens_profiled(t, profile)
+        )
+        results = []
+        for t in texts:
+            tokens = filter_tokens(t)
+            results.append(' '.join(tokens) if len(tokens) >= 2 else '[cleaned_empty]')
+        if profile is not None:
+            profile.add("clean:tokens", time.perf_counter() - start, items=len(texts))
+            profile.count("texts_cleaned_empty", results.count('[cleaned_empty]'))
+        cleaned[is_text] = results
+        return cleaned
+
+def get_text_cleaner(config=None):
+    """Compiled TextCleaner for a config, rebuilt only when the config changes"""
     if config is None:
         config = CONFIG["text_preprocessing"]
 
-    if not config["enabled"]:
-        return text
-
-    # Step 1: Basic cleaning
-    t = text.lower() if config["lowercase"] else text
+    cleaner = _TEXT_CLEANERS.get(id(config))
+    if cleaner is None or cleaner.config != config:
+        cleaner = TextCleaner(config)
+        _TEXT_CLEANERS[id(config)] = cleaner
+    return cleaner
 
-    if config["remove_urls"]:
-        t = re.sub(r'http\S+|www\.\S+', '', t)
-
-    if config["remove_mentions"]:
-        t = re.sub(r'@\w+', '', t)
-
-    if config["remove_hashtags"]:
-        t = re.sub(r'#\w+', '', t)
-
-    if config["normalize_whitespace"]:
-        t = re.sub(r'\s+', ' ', t).strip()
-
-    if config["remove_punctuation"]:
-        t = re.sub(r'[^\w\s#@]', ' ', t)
-
-    if config["remove_numbers"]:
-        t = re.sub(r'\d+', '', t)
-
-    if config["remove_extra_spaces"]:
-        t = re.sub(r'\s+', ' ', t).strip()
+def clean_text_advanced(text, config=None):
+    """Advanced text preprocessing with Sastrawi integration"""
+    if pd.isna(text) or text == '' or not isinstance(text, str):
+        return ''
 
-    if config["remove_single_chars"]:
-        t = re.sub(r'\b\w\b', '', t)
+    return get_text_cleaner(config).clean(text)
 
-    # Step 2: Word length filtering
-    if config["min_word_length"] > 1:
-        t = ' '.join([w for w in t.split() if len(w) >= config["min_word_length"]])
+def _init_clean_worker(config, settings):
+    """Pool initializer: build the stemmer, stem cache and stopword set once per worker"""
+    global _WORKER_CONFIG, _STEM_CACHE
+    _WORKER_CONFIG = config
+    # Worker hasil spawn tidak mewarisi CONFIG yang sudah diubah lewat options
+    CONFIG.update(settings)
 
-    # Step 3: Sastrawi Stemming (before stopword removal for better accuracy)
+    # Koneksi SQLite milik parent tidak boleh dipakai ulang di proses anak
+    _STEM_CACHE = None
+    # Profil parent (hasil fork) jangan ikut terhitung dua kali
+    _take_worker_profile()
     if config["use_sastrawi_stemming"] and SASTRAWI_AVAILABLE:
-        t = apply_sastrawi_stemming(t)
-
-    # Step 4: Stopword removal with combined stopwords
+        get_stem_cache()
     if config["remove_stopwords"]:
-        combined_stopwords = get_combined_stopwords(config)
-        words = t.split()
-        filtered_words = [w for w in words if w.lower() not in combined_stopwords]
-        t = ' '.join(filtered_words)
-
-    # Step 5: Remove duplicate words
-    if config["remove_duplicate_words"]:
-        seen = set()
-        unique = []
-        for w in t.split():
-            if w.lower() not in seen:  # Case-insensitive duplicate removal
-                seen.add(w.lower())
-                unique.append(w)
-        t = ' '.join(unique)
-
-    # Step 6: Final cleanup
-    t = re.sub(r'\s+', ' ', t).strip()
-    
-    # Return cleaned text or mark as empty if too short
-    return t if len(t.split()) >= 2 else '[cleaned_empty]'
-
-def normalize_datetime_format(val):
-    """Normalisasi format datetime menjadi YYYY-MM-DD HH:MM:SS"""
-    if pd.isna(val) or val == '' or val == 'N/A':
-        return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-    if isinstance(val, (pd.Timestamp, datetime)):
-        return val.strftime('%Y-%m-%d %H:%M:%S')
-
-    parsed = pd.to_datetime(str(val).strip(), errors='coerce')
-    if pd.isna(parsed):
-        return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        get_stopword_registry(config)
+
+def _clean_text_chunk(texts):
+    """Clean one chunk of texts inside a worker process"""
+    cleaned = [clean_text_advanced(text, _WORKER_CONFIG) for text in texts]
+    if _STEM_CACHE is not None:
+        _STEM_CACHE.flush()
+    return cleaned, _take_worker_profile()
+
+def _clean_texts(series, config):
+    """Clean a column of texts, in chunks on a process pool when enabled"""
+    parallel = CONFIG["parallel"]
+    workers = parallel["workers"] or os.cpu_count() or 1
+    chunk_size = max(1, parallel["chunk_size"])
+    if not parallel["enabled"] or workers < 2 or len(series) <= chunk_size:
+        return get_text_cleaner(config).clean_series(series)
+
+    texts = series.tolist()
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    workers = min(workers, len(chunks))
+    log_activity(f"⚡ Cleaning {len(texts)} texts in {len(chunks)} chunks on {workers} workers")
+
+    # fork lebih cepat: worker langsung mewarisi Sastrawi dan stopword yang sudah di-load
+    mp_context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+    settings = {key: CONFIG[key] for key in ("cache_dir", "stem_cache_max_items", "enable_logging", "profile")}
+    cleaned = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                             initializer=_init_clean_worker, initargs=(config, settings)) as executor:
+        # executor.map mengembalikan hasil sesuai urutan chunk
+        for chunk_result, worker_profile in executor.map(_clean_text_chunk, chunks):
+            cleaned.extend(chunk_result)
+            merge_worker_profile(worker_profile)
+
+    return pd.Series(cleaned, index=series.index, name=series.name)
+
+def clean_text_column(series, config=None):
+    """Apply clean_text_advanced to a whole column, cleaning each distinct text only once"""
+    if config is None:
+        config = CONFIG["text_preprocessing"]
 
-    return parsed.strftime('%Y-%m-%d %H:%M:%S')
+    is_text = series.map(lambda x: isinstance(x, str) and x != '')
+    cleaned = pd.Series('', index=series.index, dtype=object, name=series.name)
+    if not is_text.any():
+        return cleaned
+
+    # Retweet, caption repost, teks yang sama di frame SNA: cukup dibersihkan sekali
+    codes, distinct = pd.factorize(series[is_text])
+    distinct = pd.Series(distinct, dtype=object)
+    results = pd.Series(None, index=distinct.index, dtype=object)
+
+    if CONFIG["cleaned_text_cache"]:
+        cache = get_clean_text_cache(config)
+        hashes = [CleanTextCache.text_hash(t) for t in distinct]
+        found = cache.get_many(hashes)
+        is_cached = pd.Series([h in found for h in hashes], index=distinct.index)
+        results[is_cached] = [found[h] for h, hit in zip(hashes, is_cached) if hit]
+
+        missing = distinct[~is_cached]
+        if len(missing):
+            results[~is_cached] = _clean_texts(missing, config)
+            cache.put_many([(hashes[i], results[i]) for i in missing.index])
+        log_activity(f"♻️ Cleaned-text cache: {int(is_cached.sum())}/{len(distinct)} distinct texts reused "
+                     f"({len(series)} rows)")
+    else:
+        results = _clean_texts(distinct, config)
+
+    profile = get_profile()
+    if profile is not None:
+        profile.count("texts", int(is_text.sum()))
+        profile.count("texts_distinct", len(distinct))
+        if CONFIG["cleaned_text_cache"]:
+            profile.count("texts_from_clean_cache", int(is_cached.sum()))
+
+    cleaned[is_text] = results.to_numpy()[codes]
+    return cleaned
+
+# Kolom token hanya ada di memori dan Parquet; CSV tetap berisi teks bersih saja
+TOKEN_COLUMNS = ["tokens", "token_ids"]
+
+def token_lists(cleaned):
+    """Token list per cleaned text, built once per distinct text
+
+    A cleaned text is ' '.join of its final tokens (for fresh, cached and worker
+    results alike), so splitting it gives back exactly the pipeline's token stream.
+    """
+    codes, distinct = pd.factorize(cleaned)
+    lists = [text.split() if text != '[cleaned_empty]' else [] for text in distinct]
+    return pd.Series([lists[c] if c >= 0 else [] for c in codes], index=cleaned.index, dtype=object)
+
+class Vocabulary:
+    """Shared token <-> integer id mapping, persisted as a JSON token list (id = position)"""
+
+    def __init__(self, tokens=()):
+        self.tokens = []
+        self.ids = {}
+        for token in tokens:
+            self.add(token)
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def add(self, token):
+        token_id = self.ids.get(token)
+        if token_id is None:
+            token_id = self.ids[token] = len(self.tokens)
+            self.tokens.append(token)
+        return token_id
+
+    def encode(self, tokens):
+        return [self.add(token) for token in tokens]
+
+    def decode(self, ids):
+        return [self.tokens[i] for i in ids]
+
+    def encode_series(self, token_series):
+        """Token ids for a column of token lists, encoding each distinct list once"""
+        keys = token_series.map(' '.join)
+        codes, distinct = pd.factorize(keys)
+        encoded = [self.encode(key.split()) for key in distinct]
+        return pd.Series([encoded[c] for c in codes], index=token_series.index, dtype=object)
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(json.load(f)["tokens"])
+        except (OSError, ValueError, KeyError):
+            return cls()
+
+    def save(self, path):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"size": len(self.tokens), "tokens": self.tokens}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+def add_token_ids(frames, path):
+    """Encode the tokens column of every frame against the vocabulary stored at path"""
+    vocabulary = Vocabulary.load(path)
+    initial_size = len(vocabulary)
+    for frame in frames:
+        if "tokens" in frame.columns:
+            frame["token_ids"] = vocabulary.encode_series(frame["tokens"])
+    vocabulary.save(path)
+    log_activity(f"🔢 Token vocabulary: {len(vocabulary)} tokens ({len(vocabulary) - initial_size} new)")
+    return vocabulary
+
+# Semua waktu dinormalisasi ke UTC; di CSV ditulis tanpa offset dengan format ini
+DATETIME_COLUMNS = ['timestamp', 'scraped_at']
+DATETIME_OUTPUT_FORMAT = '%Y-%m-%d %H:%M:%S'
+DATETIME_SAMPLE_SIZE = 1000
+
+def _parse_epoch(numbers):
+    """Epoch numbers to UTC datetimes; s/ms/us/ns is picked per value from its magnitude"""
+    parsed = pd.Series(pd.NaT, index=numbers.index, dtype='datetime64[ns, UTC]')
+    magnitude = numbers.abs()
+    seconds = numbers / np.select([magnitude < 1e11, magnitude < 1e14, magnitude < 1e17], [1, 1e3, 1e6], 1e9)
+    # Di luar rentang datetime64[ns] (tahun 1677-2262) dianggap tidak valid
+    in_range = seconds.abs() < 9.2e9
+    if in_range.any():
+        parsed[in_range] = pd.to_datetime(seconds[in_range], unit='s', utc=True, errors='coerce')
+    return parsed
+
+def _parse_datetimes(values, fmt):
+    """Parse a column of non-missing values with one detected format"""
+    if fmt == 'epoch':
+        return _parse_epoch(pd.to_numeric(values, errors='coerce'))
+    return pd.to_datetime(values, format=fmt, utc=True, errors='coerce')
+
+def detect_datetime_format(sample):
+    """Pick the format ('epoch', 'ISO8601' or 'mixed') that parses most of a sample"""
+    best_format, best_rate = 'mixed', -1.0
+    for fmt in ('epoch', 'ISO8601', 'mixed'):
+        rate = _parse_datetimes(sample, fmt).notna().mean()
+        if rate == 1.0:
+            return fmt
+        if rate > best_rate:
+            best_format, best_rate = fmt, rate
+    return best_format
+
+def normalize_datetime_column(values):
+    """Vectorized datetime normalization; returns (datetime64[ns, UTC] series, number of coerced values)
+
+    The format is detected once per column (Twitter/Instagram ISO with Z, TikTok ISO with
+    offset, Facebook epoch seconds, naive scraped_at strings read as UTC) and only the rows
+    that format cannot parse are retried one by one. Missing values stay NaT instead of
+    being filled with the current time.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        if values.dt.tz is None:
+            return values.dt.tz_localize('UTC'), 0
+        return values.dt.tz_convert('UTC'), 0
+
+    result = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns, UTC]', name=values.name)
+    present = values.notna()
+    if values.dtype == object:
+        values = values.astype(str)
+        present &= ~values.isin(['', 'N/A'])
+    if not present.any():
+        return result, 0
+
+    values = values[present]
+    fmt = 'epoch' if pd.api.types.is_numeric_dtype(values) else detect_datetime_format(values.head(DATETIME_SAMPLE_SIZE))
+    parsed = _parse_datetimes(values, fmt)
+
+    # Fallback per baris untuk nilai yang tidak cocok dengan format kolom
+    failed = parsed.isna()
+    if failed.any() and values.dtype == object:
+        if fmt != 'epoch':
+            parsed[failed] = _parse_datetimes(values[failed], 'epoch')
+            failed = parsed.isna()
+        if failed.any():
+            parsed[failed] = _parse_datetimes(values[failed], 'mixed')
+
+    result[present] = parsed
+    return result, int(parsed.isna().sum())
+
+# Suffix angka engagement: "1.2K", "3,4JT", "15RB", "2M", dst.
+COUNT_MULTIPLIERS = {"": 1, "K": 1_000, "RB": 1_000, "M": 1_000_000, "JT": 1_000_000, "B": 1_000_000_000}
+COUNT_PATTERN = r'^\s*(?P<number>[\d.,]+)\s*(?P<suffix>[KMB]|RB|JT)?\s*$'
+# Tanpa suffix "1.234" / "1,234,567" adalah pemisah ribuan, bukan desimal
+COUNT_THOUSANDS_PATTERN = r'\d{1,3}(?:[.,]\d{3})+'
+METRIC_COLUMNS = ['likes', 'shares', 'comments', 'views']
+
+def _parse_count_strings(strings):
+    """Parse count strings into Int64; values that are not a whole count become <NA>
+
+    A number with an optional K/RB/M/JT/B suffix; ',' is read as a decimal
+    point ("3,4JT") except in thousands-separated numbers without a suffix.
+    Malformed numbers ("1.2.3K") and fractional counts ("1.5", "1,23") are <NA>.
+    """
+    parts = strings.str.extract(COUNT_PATTERN, flags=re.IGNORECASE)
+    number = parts["number"]
+    has_suffix = parts["suffix"].notna()
+    multiplier = pd.Series(1, index=strings.index, dtype="int64")
+    multiplier[has_suffix] = parts.loc[has_suffix, "suffix"].str.upper().map(COUNT_MULTIPLIERS)
+
+    plain = number.notna() & ~has_suffix
+    thousands = number[plain].str.fullmatch(COUNT_THOUSANDS_PATTERN)
+    thousands = thousands[thousands.astype(bool)].index
+    number[thousands] = number[thousands].str.replace(r'[.,]', '', regex=True)
+    value = pd.to_numeric(number.str.replace(',', '.', regex=False), errors="coerce") * multiplier
+
+    # Dibulatkan dulu: 4.35 * 1000 = 4349.999... di float
+    value = value.round(6)
+    value = value.where((value == np.floor(value)) & (value < 2.0 ** 63))
+
+    # Kosong dan "N/A" dianggap 0
+    unmatched = number.isna()
+    empty = strings[unmatched].str.strip().str.upper().isin(["", "N/A"])
+    value[empty[empty].index] = 0
+    return value.astype("Int64")
+
+def parse_engagement_counts(values):
+    """Vectorized K/M/B/JT/RB count parser; returns (Int64 series, number of unparseable values)
+
+    Missing values ('', 'N/A', NaN) become 0 like before; values that cannot be
+    parsed become <NA> instead of being silently turned into 0. Only distinct
+    values are parsed, so repetitive engagement columns are cheap.
+    """
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        numbers = pd.to_numeric(values, errors="coerce").astype("float64")
+        invalid = np.isinf(numbers.to_numpy())
+        parsed = pd.Series(np.trunc(numbers.fillna(0).to_numpy()), index=values.index).mask(invalid)
+        return parsed.astype("Int64").rename(values.name), int(invalid.sum())
+
+    # Cukup parse nilai unik: kolom engagement sangat berulang (0, 1, "1K", ...)
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques, dtype=object)
+
+    if pd.api.types.infer_dtype(uniques, skipna=False) == "string":
+        parsed = _parse_count_strings(uniques)
+    else:
+        parsed = pd.Series(pd.NA, index=uniques.index, dtype="Int64")
+        is_string = np.fromiter((isinstance(v, str) for v in uniques), dtype=bool, count=len(uniques))
+        is_number = ~is_string
+        if is_number.any():
+            numbers = pd.to_numeric(uniques[is_number], errors="coerce").astype("float64")
+            finite = np.isfinite(numbers)
+            parsed[is_number] = np.trunc(numbers.where(finite, np.nan)).astype("Int64").to_numpy()
+        if is_string.any():
+            parsed[is_string] = _parse_count_strings(uniques[is_string]).to_numpy()
+
+    unparseable = int(parsed.isna().to_numpy()[codes[codes >= 0]].sum())
+    result = parsed.array.take(codes, allow_fill=True, fill_value=0)
+    return pd.Series(result, index=values.index, name=values.name), unparseable
 
-def normalize_numeric_value(val):
-    """Normalisasi nilai numerik dari format K, M, B, dll."""
-    if pd.isna(val) or val == '' or val == 'N/A':
-        return 0
+# ==============================
+# NEAR-DUPLICATE DETECTION
+# ==============================
+# MinHash + LSH: teks copy-paste / kampanye terkoordinasi yang hanya beda satu-dua kata
+NEAR_DUPLICATE_COLUMN = "near_duplicate_cluster"
+# Jumlah shingle yang di-hash sekaligus (matriks num_perm x batch di memori)
+MINHASH_BATCH = 200_000
+# Bobot pasangan yang terlewat vs kandidat palsu saat memilih jumlah band LSH
+LSH_FALSE_NEGATIVE_WEIGHT = 0.9
+
+def lsh_bands(threshold, num_perm):
+    """(bands, rows) with bands * rows <= num_perm minimizing the weighted false positive/negative area
+
+    Two texts with Jaccard s share a bucket with probability 1 - (1 - s^rows)^bands.
+    Every candidate is verified on its full signature afterwards, so a false
+    positive only costs one comparison and missed pairs are weighted heavier.
+    """
+    s = np.linspace(0, 1, 201)
+    best = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        candidate = 1 - (1 - s ** rows) ** bands
+        error = np.where(
+            s < threshold,
+            (1 - LSH_FALSE_NEGATIVE_WEIGHT) * candidate,
+            LSH_FALSE_NEGATIVE_WEIGHT * (1 - candidate)
+        ).mean()
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+def shingle_keys(texts, shingle_size):
+    """64-bit key per word n-gram shingle of each text; returns (keys, offsets)
+
+    Words are factorized once, then each shingle key is rolled from the word
+    ids in numpy. Texts shorter than shingle_size become a single shingle,
+    empty texts none.
+    """
+    words = [text.split() for text in texts]
+    lengths = np.fromiter((len(w) for w in words), dtype=np.int64, count=len(words))
+    # +1: id 0 dipakai sebagai padding untuk teks yang lebih pendek dari shingle_size
+    codes = pd.factorize(pd.Series([w for ws in words for w in ws], dtype=object))[0].astype(np.uint64) + np.uint64(1)
+
+    counts = np.where(lengths > 0, np.maximum(lengths - shingle_size + 1, 1), 0)
+    offsets = np.r_[0, np.cumsum(counts)]
+    word_starts = np.r_[0, np.cumsum(lengths)[:-1]]
+    doc = np.repeat(np.arange(len(words)), counts)
+    positions = word_starts[doc] + np.arange(offsets[-1]) - offsets[doc]
+    word_ends = (word_starts + lengths)[doc]
+
+    keys = np.zeros(len(positions), dtype=np.uint64)
+    for j in range(shingle_size):
+        pos = positions + j
+        valid = pos < word_ends
+        keys *= np.uint64(1_000_003)
+        keys += np.where(valid, codes[np.minimum(pos, len(codes) - 1)] if len(codes) else 0, 0).astype(np.uint64)
+    return keys, offsets
+
+def minhash_signatures(texts, num_perm=128, shingle_size=2, seed=1):
+    """MinHash signature per text, shape (len(texts), num_perm); empty texts get all-max rows
+
+    Each permutation is a multiply-shift hash (a * x + b mod 2^64) >> 32 with odd a.
+    """
+    keys, offsets = shingle_keys(texts, shingle_size)
+    rng = np.random.default_rng(seed)
+    a = (rng.integers(0, 2**63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1))[:, None]
+    b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)[:, None]
+
+    signatures = np.full((len(offsets) - 1, num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+    has_shingles = np.flatnonzero(offsets[1:] > offsets[:-1])
+    # Batch per kelompok dokumen (~MINHASH_BATCH shingle) supaya matriks hash tidak meledak di memori
+    cuts = np.unique(np.searchsorted(offsets[has_shingles], np.arange(0, offsets[-1], MINHASH_BATCH)))
+    for start, end in zip(cuts, np.r_[cuts[1:], len(has_shingles)]):
+        docs = has_shingles[start:end]
+        lo, hi = offsets[docs[0]], offsets[docs[-1] + 1]
+        hashes = a * keys[lo:hi]
+        hashes += b
+        hashes >>= np.uint64(32)
+        signatures[docs] = np.minimum.reduceat(hashes.astype(np.uint32), offsets[docs] - lo, axis=1).T
+    return signatures
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+def near_duplicate_clusters(texts, threshold=None, num_perm=None, shingle_size=None):
+    """Cluster near-identical texts; returns the representative (last) position of each text's cluster
+
+    Candidates come from LSH banding (one bucket pass per band, linear in the
+    number of texts); each candidate is confirmed only if its estimated
+    Jaccard similarity to the bucket's first member reaches the threshold.
+    """
+    settings = CONFIG["near_duplicates"]
+    threshold = settings["threshold"] if threshold is None else threshold
+    num_perm = num_perm or settings["num_perm"]
+    shingle_size = shingle_size or settings["shingle_size"]
+
+    texts = list(texts)
+    n = len(texts)
+    if n < 2:
+        return np.arange(n)
+
+    signatures = minhash_signatures(texts, num_perm, shingle_size, settings["seed"])
+    bands, rows = lsh_bands(threshold, num_perm)
+    has_shingles = signatures[:, 0] != np.iinfo(np.uint32).max
+    multipliers = np.random.default_rng(settings["seed"]).integers(1, 2**63, rows, dtype=np.uint64)
+
+    parent = np.arange(n)
+    for band in range(bands):
+        # Satu kunci uint64 per dokumen per band (overflow disengaja, cukup sebagai hash)
+        keys = (signatures[:, band * rows:(band + 1) * rows].astype(np.uint64) * multipliers).sum(axis=1)
+        docs = np.flatnonzero(has_shingles)
+        order = docs[np.argsort(keys[docs], kind="stable")]
+        sorted_keys = keys[order]
+        starts = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+        # Setiap anggota bucket dibandingkan dengan anggota pertama bucket itu
+        first = order[np.maximum.accumulate(np.where(starts, np.arange(len(order)), 0))]
+        candidates = ~starts
+        left, right = first[candidates], order[candidates]
+        if not len(left):
+            continue
+        similarity = (signatures[left] == signatures[right]).mean(axis=1)
+        for i, j in zip(left[similarity >= threshold], right[similarity >= threshold]):
+            root_i, root_j = _find(parent, i), _find(parent, j)
+            if root_i != root_j:
+                parent[min(root_i, root_j)] = max(root_i, root_j)
+
+    roots = np.array([_find(parent, i) for i in range(n)])
+    # Representatif = anggota terakhir, sama dengan drop_duplicates(keep='last')
+    representative = np.zeros(n, dtype=np.int64)
+    np.maximum.at(representative, roots, np.arange(n))
+    return representative[roots]
+
+def remove_near_duplicates(df, text_column='content_text'):
+    """Drop near-duplicate texts (keeping the last of each cluster) or tag them, per CONFIG["near_duplicates"]"""
+    settings = CONFIG["near_duplicates"]
+    if len(df) < 2:
+        return df
 
-    if isinstance(val, (int, float)):
-        return int(val)
+    representative = near_duplicate_clusters(df[text_column].fillna("").astype(str))
+    positions = np.arange(len(df))
+    duplicates = int((representative != positions).sum())
+    if settings["mode"] == "tag":
+        clustered = np.bincount(representative, minlength=len(df))[representative] > 1
+        # Id cluster = hash teks representatif: stabil antar run dan unik lintas platform
+        rep_texts = df[text_column].to_numpy()[representative]
+        df = df.copy()
+        df[NEAR_DUPLICATE_COLUMN] = [
+            hashlib.blake2b(str(t).encode("utf-8"), digest_size=6).hexdigest() if c else None
+            for t, c in zip(rep_texts, clustered)
+        ]
+        if duplicates:
+            log_activity(f"🧬 Tagged {int(clustered.sum())} records in near-duplicate clusters")
+        return df
 
-    s = str(val).strip().upper().replace(',', '').replace(' ', '')
-    try:
-        if 'K' in s:
-            return int(float(s.replace('K', '')) * 1000)
-        if 'M' in s:
-            return int(float(s.replace('M', '')) * 1_000_000)
-        if 'B' in s:
-            return int(float(s.replace('B', '')) * 1_000_000_000)
-        if 'JT' in s:
-            return int(float(s.replace('JT', '')) * 1_000_000)
-        if 'RB' in s:
-            return int(float(s.replace('RB', '')) * 1000)
-        return int(float(s.replace('.', ''))) if s.replace('.', '').isdigit() else int(float(s))
-    except:
-        return 0
+    if duplicates:
+        log_activity(f"🧬 Removed {duplicates} near-duplicate records")
+    return df[representative == positions]
 
 def get_column(df, preferred, fallback_list):
     """Ambil kolom dengan prioritas, fallback kalau tidak ada"""
@@ -232,20 +1400,36 @@ def get_column(df, preferred, fallback_list):
             return df[fb]
     return None
 
-def preprocess_dataframe(df, text_column='content_text', normalize_metrics=True):
-    """Preprocessing dataframe dengan advanced text cleaning dan normalisasi"""
+def preprocess_dataframe(df, text_column='content_text', normalize_metrics=True, drop_duplicates=True,
+                         collect_stats=False, clean_text=True):
+    """Preprocessing dataframe dengan advanced text cleaning dan normalisasi
+
+    collect_stats adds the frame to the run's PreprocessingStats (sentimen frames);
+    without drop_duplicates only the empty count is added, the caller adds the
+    final rows once they are deduplicated. clean_text=False is for frames whose
+    text column is already cleaned (normalized SNA).
+    """
     if df.empty:
         return df
 
     log_activity(f"🔄 Preprocessing {len(df)} records...")
+    profile = get_profile()
+    if profile is not None:
+        started = time.perf_counter()
+        profile.count("rows_in", len(df))
 
     # Text preprocessing dengan Sastrawi
     if text_column in df.columns:
-        df['content_original'] = df[text_column].copy()
-        
-        # Apply advanced text cleaning with Sastrawi
-        log_activity("🧹 Applying advanced text preprocessing...")
-        df[text_column] = df[text_column].apply(lambda x: clean_text_advanced(x))
+        if clean_text:
+            df['content_original'] = df[text_column].copy()
+
+            # Bangun stopword set sekali di sini, bukan per baris
+            if CONFIG["text_preprocessing"]["remove_stopwords"]:
+                get_stopword_registry()
+
+            # Apply advanced text cleaning with Sastrawi
+            log_activity("🧹 Applying advanced text preprocessing...")
+            df[text_column] = profiled_call("clean_text_column", clean_text_column, df[text_column], items=len(df))
         
         # Remove empty cleaned content
         initial_count = len(df)
@@ -253,27 +1437,68 @@ def preprocess_dataframe(df, text_column='content_text', normalize_metrics=True)
         removed_count = initial_count - len(df)
         if removed_count > 0:
             log_activity(f"🗑️ Removed {removed_count} empty/invalid text records")
+        if profile is not None:
+            profile.count("rows_removed_empty", removed_count)
+        if collect_stats:
+            get_stats().add_empty(removed_count)
+
+        # Token stream untuk tahap sentimen/topic berikutnya, tanpa tokenisasi ulang
+        if CONFIG["tokens"]["enabled"]:
+            df["tokens"] = profiled_call("token_lists", token_lists, df[text_column], items=len(df))
 
     # Datetime normalization
-    datetime_cols = ['timestamp', 'scraped_at']
-    for col in datetime_cols:
+    coerced = 0
+    for col in DATETIME_COLUMNS:
         if col in df.columns:
-            df[col] = df[col].apply(normalize_datetime_format)
+            df[col], bad = profiled_call(f"datetime:{col}", normalize_datetime_column, df[col], items=len(df))
+            coerced += bad
+    if coerced:
+        log_activity(f"⚠️ {coerced} datetime values could not be parsed (left empty)")
 
     # Numeric normalization
+    unparseable = 0
     if normalize_metrics:
-        metric_cols = ['likes', 'shares', 'comments', 'views']
-        for col in metric_cols:
+        for col in METRIC_COLUMNS:
             if col in df.columns:
-                df[col] = df[col].apply(normalize_numeric_value)
+                df[col], bad = profiled_call(f"metrics:{col}", parse_engagement_counts, df[col], items=len(df))
+                unparseable += bad
+        if unparseable:
+            log_activity(f"⚠️ {unparseable} engagement values could not be parsed (left empty)")
 
-    # Remove duplicates based on content
-    if text_column in df.columns:
+    # Remove duplicates based on content (mode streaming men-dedup sendiri lintas chunk)
+    if drop_duplicates and text_column in df.columns:
         initial_count = len(df)
-        df = df.drop_duplicates(subset=[text_column], keep='last')
+        df = profiled_call("drop_duplicates", df.drop_duplicates, subset=[text_column], keep='last', items=len(df))
         removed_count = initial_count - len(df)
         if removed_count > 0:
             log_activity(f"🔗 Removed {removed_count} duplicate records")
+        if profile is not None:
+            profile.count("rows_removed_duplicates", removed_count)
+
+        if CONFIG["near_duplicates"]["enabled"]:
+            initial_count = len(df)
+            df = profiled_call("near_duplicates", remove_near_duplicates, df, text_column, items=len(df))
+            if profile is not None:
+                profile.count("rows_removed_near_duplicates", initial_count - len(df))
+
+    if SASTRAWI_AVAILABLE and CONFIG["text_preprocessing"]["use_sastrawi_stemming"]:
+        stem_cache = get_stem_cache()
+        stem_cache.flush()
+        stats = stem_cache.stats()
+        if stats["lookups"]:
+            log_activity(f"🌱 Stem cache: {stats['hit_rate']:.1%} hit rate "
+                         f"({stats['memo_hits']} memo, {stats['memory_hits'] + stats['disk_hits']} cached), "
+                         f"{stats['misses']} new stems, {stats['memory_size']} in memory, "
+                         f"{stats['disk_size']} on disk")
+
+    if collect_stats and drop_duplicates and text_column in df.columns:
+        get_stats().update(df['content_original'], df[text_column])
+
+    if profile is not None:
+        profile.count("datetimes_coerced", coerced)
+        profile.count("metrics_unparseable", unparseable)
+        profile.count("rows_out", len(df))
+        profile.add("preprocess_dataframe", time.perf_counter() - started, items=len(df))
 
     log_activity(f"✅ Preprocessing complete. {len(df)} records remaining.")
     return df
@@ -281,298 +1506,1203 @@ def preprocess_dataframe(df, text_column='content_text', normalize_metrics=True)
 # ==============================
 # PREPROCESSING STATISTICS
 # ==============================
-def show_preprocessing_stats(original_text, cleaned_text, sample_size=5):
+class PreprocessingStats:
+    """Running statistics of the sentimen texts, collected while preprocessing.
+
+    Counts are plain sums and the example sample keeps the texts with the
+    smallest hash keys (a bottom-k reservoir), so stats from chunks, worker
+    processes and earlier incremental runs merge without re-reading any data.
+    """
+
+    def __init__(self, sample_size=None):
+        self.sample_size = sample_size or CONFIG["preprocessing_stats"]["sample_size"]
+        self.rows = 0
+        self.words_before = 0
+        self.words_after = 0
+        self.empty_after_cleaning = 0
+        # hash key -> [original, cleaned]
+        self.sample = {}
+
+    def add_empty(self, count):
+        self.empty_after_cleaning += count
+
+    def update(self, original, cleaned):
+        """Add the final (original, cleaned) text pairs of a frame or chunk"""
+        valid = original.notna() & cleaned.notna() & (cleaned != '[cleaned_empty]')
+        original = original[valid].astype(str)
+        cleaned = cleaned[valid].astype(str)
+        valid = (cleaned.str.strip() != '').to_numpy()
+        original, cleaned = original[valid], cleaned[valid]
+        if original.empty:
+            return
+
+        self.rows += len(original)
+        self.words_before += int(original.str.count(r'\S+').sum())
+        self.words_after += int(cleaned.str.count(r'\S+').sum())
+
+        # Sampel deterministik: hash teks, bukan urutan baris atau proses
+        keys = pd.util.hash_pandas_object(original, index=False).to_numpy()
+        smallest = np.argsort(keys, kind="stable")[:self.sample_size]
+        self._add_sample(
+            (int(keys[i]), [original.iloc[i], cleaned.iloc[i]]) for i in smallest
+        )
+
+    def _add_sample(self, items):
+        self.sample.update(items)
+        if len(self.sample) > self.sample_size:
+            self.sample = dict(sorted(self.sample.items())[:self.sample_size])
+
+    def merge(self, data):
+        """Add stats collected elsewhere (the to_dict() of a worker, chunk or earlier run)"""
+        self.rows += data["rows"]
+        self.words_before += data["words_before"]
+        self.words_after += data["words_after"]
+        self.empty_after_cleaning += data["empty_after_cleaning"]
+        self._add_sample((int(key), pair) for key, pair in data["sample"])
+
+    def to_dict(self):
+        return {
+            "rows": self.rows,
+            "words_before": self.words_before,
+            "words_after": self.words_after,
+            "empty_after_cleaning": self.empty_after_cleaning,
+            "sample": [[key, pair] for key, pair in sorted(self.sample.items())]
+        }
+
+    def summary(self):
+        """Averages and word reduction, as written to preprocessing_report.csv"""
+        if not self.rows or not self.words_before:
+            return {}
+        return {
+            "avg_words_before": round(self.words_before / self.rows, 2),
+            "avg_words_after": round(self.words_after / self.rows, 2),
+            "word_reduction_pct": round((1 - self.words_after / self.words_before) * 100, 2),
+            "empty_after_cleaning": self.empty_after_cleaning
+        }
+
+    def removed_stopwords(self, top=10):
+        """Most frequently removed stopwords, estimated from the sample texts"""
+        cleaner = get_text_cleaner()
+        if cleaner.stopwords is None:
+            return []
+        removed = Counter()
+        for original, _ in self.sample.values():
+            removed.update(cleaner.removed_stopwords(original))
+        return removed.most_common(top)
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": preprocessing_fingerprint(), **self.to_dict()}, f)
+
+    @classmethod
+    def load(cls, path):
+        """Stats saved by an earlier run with the same preprocessing, or None"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("fingerprint") != preprocessing_fingerprint():
+            return None
+        stats = cls()
+        stats.merge(data)
+        return stats
+
+def get_stats():
+    """PreprocessingStats of the current run"""
+    global _STATS
+    if _STATS is None:
+        _STATS = PreprocessingStats()
+    return _STATS
+
+def reset_stats(previous=None):
+    """Start the run's stats, optionally continuing from an earlier run's"""
+    global _STATS
+    _STATS = previous
+    return get_stats()
+
+def _take_worker_stats():
+    """Stats collected in this worker since the last call, as a dict (None when empty)"""
+    global _STATS
+    stats, _STATS = _STATS, None
+    return stats.to_dict() if stats is not None else None
+
+def merge_worker_stats(data):
+    """Merge a worker's _take_worker_stats() result into the run's stats"""
+    if data:
+        get_stats().merge(data)
+
+def show_preprocessing_stats(stats, sample_size=5):
     """Show preprocessing statistics and examples"""
     log_activity("📊 Preprocessing Statistics:")
-    
-    # Calculate basic stats
-    original_words = [len(str(text).split()) for text in original_text if pd.notna(text)]
-    cleaned_words = [len(str(text).split()) for text in cleaned_text if pd.notna(text) and text != '[cleaned_empty]']
-    
-    if original_words and cleaned_words:
-        log_activity(f"   📝 Average words before: {sum(original_words)/len(original_words):.1f}")
-        log_activity(f"   📝 Average words after: {sum(cleaned_words)/len(cleaned_words):.1f}")
-        log_activity(f"   📉 Word reduction: {(1 - sum(cleaned_words)/sum(original_words))*100:.1f}%")
-    
+
+    if stats.rows and stats.words_before:
+        log_activity(f"   📝 Average words before: {stats.words_before / stats.rows:.1f}")
+        log_activity(f"   📝 Average words after: {stats.words_after / stats.rows:.1f}")
+        log_activity(f"   📉 Word reduction: {(1 - stats.words_after / stats.words_before) * 100:.1f}%")
+    log_activity(f"   🗑️ Empty after cleaning: {stats.empty_after_cleaning}")
+
+    top_stopwords = stats.removed_stopwords(CONFIG["preprocessing_stats"]["top_stopwords"])
+    if top_stopwords:
+        log_activity(f"   🚫 Top removed stopwords (sample of {len(stats.sample)} texts): "
+                     + ", ".join(f"{word} ({count})" for word, count in top_stopwords))
+
     # Show examples
     log_activity(f"\n🔍 Preprocessing Examples (showing {sample_size} samples):")
-    valid_indices = [i for i, text in enumerate(cleaned_text) 
-                    if pd.notna(text) and text != '[cleaned_empty]' and pd.notna(original_text.iloc[i])]
-    
-    for i, idx in enumerate(valid_indices[:sample_size]):
+    for i, (original, cleaned) in enumerate(list(stats.sample.values())[:sample_size]):
         log_activity(f"\n   Example {i+1}:")
-        log_activity(f"   Before: {str(original_text.iloc[idx])[:100]}...")
-        log_activity(f"   After:  {str(cleaned_text.iloc[idx])[:100]}...")
+        log_activity(f"   Before: {original[:100]}...")
+        log_activity(f"   After:  {cleaned[:100]}...")
 
 # ==============================
-# 1. Load Data
+# INCREMENTAL MODE
 # ==============================
-log_activity("📁 Loading data files...")
-log_activity(f"🔧 Sastrawi integration: {'Enabled' if SASTRAWI_AVAILABLE else 'Disabled'}")
-
-files = {
-    "twitter_sentimen": "/content/twitter_politik_indonesia_auto.csv",
-    "twitter_sna": "/content/twitter_sna_relations.csv",
-    "tiktok_sentimen": "/content/tiktok_politik_auto.csv",
-    "tiktok_sna": "/content/tiktok_sna_relations.csv",
-    "instagram_sentimen": "/content/instagram_data_cleaned.csv",
-    "instagram_sna": "/content/instagram_sna_data.csv",
-    "facebook_sentimen": "/content/facebook_politik_enhanced.csv",
-    "facebook_sna": "/content/facebook_sna_relation.csv"
-}
+def make_record_keys(platform, *columns):
+    """Per-row keys from raw (not yet normalized) values, e.g. post_url + scraped_at"""
+    keys = pd.Series(platform, index=columns[0].index, dtype=object)
+    for col in columns:
+        keys = keys + "|" + col.astype(str)
+    return keys
+
+def load_manifest(path, fingerprint, output_paths):
+    """Keys processed by earlier runs; empty when outputs are missing or the preprocessing changed"""
+    empty = {"sentimen": set(), "sna": set()}
+    if not all(os.path.exists(p) for p in output_paths):
+        return empty
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return empty
+
+    if data.get("version") != MANIFEST_VERSION or data.get("fingerprint") != fingerprint:
+        log_activity("♻️ Preprocessing changed since last run, rebuilding all records")
+        return empty
+    return {kind: set(data.get(kind, [])) for kind in empty}
+
+def save_manifest(path, manifest, fingerprint):
+    """Write the processed-record manifest atomically"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": MANIFEST_VERSION,
+            "fingerprint": fingerprint,
+            "updated_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            **{kind: sorted(keys) for kind, keys in manifest.items()}
+        }, f)
+    os.replace(tmp_path, path)
+
+def keep_unprocessed(df, keys, processed, new_keys):
+    """Drop rows whose key is in the manifest and collect the keys of the rows that remain"""
+    is_new = ~keys.isin(processed)
+    new_keys.update(keys[is_new])
+    skipped = len(df) - int(is_new.sum())
+    if skipped:
+        log_activity(f"⏭️ Skipping {skipped} records processed in earlier runs")
+    return df[is_new].copy()
+
+def skip_processed(platform, sentimen, sna, sna_urls, manifest, new_keys):
+    """Incremental mode: drop rows of a platform's frames that earlier runs already processed"""
+    if manifest is None:
+        return sentimen, sna
+
+    sentimen = keep_unprocessed(
+        sentimen,
+        make_record_keys(platform, sentimen["post_url"], sentimen["scraped_at"]),
+        manifest["sentimen"], new_keys["sentimen"]
+    )
+    sna = keep_unprocessed(
+        sna,
+        make_record_keys(platform, sna_urls, sna["source"], sna["target"], sna["relation"], sna["scraped_at"]),
+        manifest["sna"], new_keys["sna"]
+    )
+    return sentimen, sna
+
+def merge_incremental(path, new_df, dedup_on, replace_on=None):
+    """Merge newly processed rows into an existing dashboard CSV"""
+    if not os.path.exists(path):
+        return new_df
+
+    existing = pd.read_csv(path)
+    # Kolom metrik dibaca ulang sebagai Int64 (sel kosong = nilai yang tidak bisa di-parse)
+    for col in METRIC_COLUMNS:
+        if col in existing.columns:
+            existing[col] = existing[col].astype("Int64")
+    # Waktu di output lama sudah UTC, parse ulang supaya dtype-nya sama dengan baris baru
+    for col in DATETIME_COLUMNS:
+        if col in existing.columns:
+            existing[col] = normalize_datetime_column(existing[col])[0]
+    if new_df.empty:
+        return existing
+
+    # Baris yang berubah (mis. post_url sama, scraped_at baru) menggantikan versi lama
+    if replace_on:
+        replaced = existing.set_index(replace_on).index.isin(new_df.set_index(replace_on).index)
+        existing = existing[~replaced]
+
+    merged = pd.concat([existing, new_df], ignore_index=True)
+    return merged.drop_duplicates(subset=dedup_on, keep="last")
 
 # ==============================
-# 2. Twitter Processing
+# PLATFORM PROCESSING
 # ==============================
-log_activity("🐦 Processing Twitter data...")
-
-tw = pd.read_csv(files["twitter_sentimen"])
-tw_sna = pd.read_csv(files["twitter_sna"])
-
-# Join via tweet_url
-tw_merged = tw_sna.merge(tw, on="tweet_url", how="left")
-
-# Normalisasi ke format dashboard
-twitter_sentimen = pd.DataFrame({
-    "platform": "twitter",
-    "author": tw["display_name"],
-    "author_username": tw["username"],
-    "content_text": tw["tweet_text"],
-    "post_url": tw["tweet_url"],
-    "timestamp": tw["timestamp"],
-    "likes": tw["likes"],
-    "shares": tw["retweets"],
-    "comments": tw["replies"],
-    "views": tw["views"],
-    "hashtags": tw["hashtags"],
-    "mentions": tw["mentions"],
-    "scraped_at": tw["scraped_at"]
-})
-
-twitter_sna = pd.DataFrame({
-    "platform": "twitter",
-    "content_text": tw_merged["tweet_text"],
-    "source": tw_merged["source"],
-    "target": tw_merged["target"],
-    "relation": tw_merged["relation"],
-    "timestamp": tw_merged["timestamp_x"],
-    "scraped_at": get_column(tw_merged, "scraped_at_x", ["scraped_at_y", "scraped_at"])
-})
-
-# Preprocessing Twitter data with Sastrawi
-log_activity("🔤 Applying Sastrawi preprocessing to Twitter data...")
-twitter_sentimen = preprocess_dataframe(twitter_sentimen)
-twitter_sna = preprocess_dataframe(twitter_sna, normalize_metrics=False)
+# Adapter per platform: file input, join relasi -> post, dan pemetaan kolom ke format dashboard.
+# Setiap kolom output diambil dari kandidat pertama yang ada (seperti get_column);
+# kolom "platform" diisi otomatis dengan nama adapter.
+PLATFORM_ADAPTERS = {
+    "twitter": {
+        "icon": "🐦",
+        "name": "Twitter",
+        "join": {"relation_key": "tweet_url", "post_key": ["tweet_url"]},
+        "sentimen": {
+            "author": ["display_name"],
+            "author_username": ["username"],
+            "content_text": ["tweet_text"],
+            "post_url": ["tweet_url"],
+            "timestamp": ["timestamp"],
+            "likes": ["likes"],
+            "shares": ["retweets"],
+            "comments": ["replies"],
+            "views": ["views"],
+            "hashtags": ["hashtags"],
+            "mentions": ["mentions"],
+            "scraped_at": ["scraped_at"]
+        },
+        "sna": {
+            "content_text": ["tweet_text"],
+            "source": ["source"],
+            "target": ["target"],
+            "relation": ["relation"],
+            "timestamp": ["timestamp_x"],
+            "scraped_at": ["scraped_at_x", "scraped_at_y", "scraped_at"]
+        }
+    },
+    "tiktok": {
+        "icon": "📱",
+        "name": "TikTok",
+        "join": {"relation_key": "video_url", "post_key": ["link"]},
+        "sentimen": {
+            "author": ["author"],
+            "author_username": ["author_username"],
+            "content_text": ["title"],
+            "post_url": ["link"],
+            "timestamp": ["timestamp"],
+            "likes": ["likes"],
+            "shares": ["shares"],
+            "comments": ["comments"],
+            "views": ["views"],
+            "hashtags": ["hashtags"],
+            "mentions": ["mentions_in_caption"],
+            "scraped_at": ["scraped_at"]
+        },
+        "sna": {
+            "content_text": ["title"],
+            "source": ["source"],
+            "target": ["target"],
+            "relation": ["relation"],
+            "timestamp": ["timestamp_x", "timestamp"],
+            "scraped_at": ["scraped_at_x", "scraped_at_y", "scraped_at"]
+        }
+    },
+    "instagram": {
+        "icon": "📷",
+        "name": "Instagram",
+        "join": {"relation_key": "post_url", "post_key": ["url"]},
+        # Samakan nama kolom scraped_at → extracted_at (biar konsisten)
+        "relation_renames": {"scraped_at": "extracted_at"},
+        "sentimen": {
+            "author": ["owner_username"],
+            "author_username": ["owner_fullname"],
+            "content_text": ["caption", "text", "content"],
+            "post_url": ["url"],
+            "timestamp": ["formatted_date", "timestamp"],
+            "likes": ["likes_count"],
+            "shares": ["reshare_count"],
+            "comments": ["comments_count"],
+            "views": ["video_play_count"],
+            "hashtags": ["hashtags"],
+            "mentions": ["mentions"],
+            "scraped_at": ["scraped_at"]
+        },
+        "sna": {
+            "content_text": ["caption", "caption_x", "caption_y", "text"],
+            "source": ["source"],
+            "target": ["target"],
+            "relation": ["relation"],
+            "timestamp": ["timestamp_x", "timestamp"],
+            "scraped_at": ["scraped_at_x", "scraped_at", "extracted_at"]
+        }
+    },
+    "facebook": {
+        "icon": "📘",
+        "name": "Facebook",
+        "join": {"relation_key": "post_url", "post_key": ["facebookUrl", "url"]},
+        "sentimen": {
+            "author": ["pageName", "user"],
+            "author_username": ["user", "pageName"],
+            "content_text": ["text"],
+            "post_url": ["facebookUrl", "url", "topLevelUrl", "link"],
+            "timestamp": ["timestamp", "time"],
+            "likes": ["likes"],
+            "shares": ["shares"],
+            "comments": ["comments"],
+            "views": ["viewsCount"],
+            "hashtags": ["hashtags"],
+            "mentions": ["mentions"],
+            "scraped_at": ["scraped_at"]
+        },
+        "sna": {
+            "content_text": ["text"],
+            "source": ["source"],
+            "target": ["target"],
+            "relation": ["relation"],
+            "timestamp": ["timestamp_x", "timestamp", "time"],
+            "scraped_at": ["scraped_at_x", "scraped_at_y", "scraped_at"]
+        }
+    }
+}
 
-# ==============================
-# 3. TikTok Processing
-# ==============================
-log_activity("📱 Processing TikTok data...")
-
-tt = pd.read_csv(files["tiktok_sentimen"])
-tt_sna = pd.read_csv(files["tiktok_sna"])
-
-tt_merged = tt_sna.merge(tt, left_on="video_url", right_on="link", how="left")
-
-tiktok_sentimen = pd.DataFrame({
-    "platform": "tiktok",
-    "author": tt["author"],
-    "author_username": tt["author_username"],
-    "content_text": tt["title"],
-    "post_url": tt["link"],
-    "timestamp": tt["timestamp"],
-    "likes": tt["likes"],
-    "shares": tt["shares"],
-    "comments": tt["comments"],
-    "views": tt["views"],
-    "hashtags": tt["hashtags"],
-    "mentions": tt["mentions_in_caption"],
-    "scraped_at": tt["scraped_at"]
-})
-
-tiktok_sna = pd.DataFrame({
-    "platform": "tiktok",
-    "content_text": tt_merged["title"],
-    "source": tt_merged["source"],
-    "target": tt_merged["target"],
-    "relation": tt_merged["relation"],
-    "timestamp": tt_merged["timestamp_x"] if "timestamp_x" in tt_merged.columns else tt_merged["timestamp"],
-    "scraped_at": get_column(tt_merged, "scraped_at_x", ["scraped_at_y", "scraped_at"])
-})
-
-# Preprocessing TikTok data with Sastrawi
-log_activity("🔤 Applying Sastrawi preprocessing to TikTok data...")
-tiktok_sentimen = preprocess_dataframe(tiktok_sentimen)
-tiktok_sna = preprocess_dataframe(tiktok_sna, normalize_metrics=False)
+def map_columns(df, platform, mapping):
+    """Build a dashboard frame from an adapter column mapping"""
+    columns = {"platform": platform}
+    for column, candidates in mapping.items():
+        columns[column] = get_column(df, candidates[0], candidates[1:])
+    return pd.DataFrame(columns, index=df.index)
+
+def sentimen_frame(platform, posts):
+    """Map raw posts of a platform to the dashboard sentimen columns"""
+    return map_columns(posts, platform, PLATFORM_ADAPTERS[platform]["sentimen"])
+
+def sna_lookup_columns(platform):
+    """Post columns an SNA join reads (suffixes _x/_y refer to the same source column)"""
+    adapter = PLATFORM_ADAPTERS[platform]
+    columns = set(adapter["join"]["post_key"])
+    for candidates in adapter["sna"].values():
+        columns.update(re.sub(r'_[xy]$', '', c) for c in candidates)
+    return columns
+
+def sna_lookup(platform, posts):
+    """URL-keyed post lookup for the SNA join: only the columns it reads, one row per URL
+
+    Every column named by the adapter is kept, so the merge suffixes (_x/_y) come
+    out exactly as when joining the full post frame. Repeated post URLs keep the
+    last row, matching drop_duplicates(keep='last') elsewhere in the pipeline.
+    """
+    join = PLATFORM_ADAPTERS[platform]["join"]
+    post_key = next((key for key in join["post_key"] if key in posts.columns), join["post_key"][0])
+    columns = [post_key] + sorted(c for c in sna_lookup_columns(platform) if c in posts.columns and c != post_key)
+    lookup = posts[columns]
+
+    # URL kosong tidak boleh ikut di-join (NaN cocok dengan NaN di pandas merge)
+    lookup = lookup[lookup[post_key].notna()]
+    duplicated = lookup[post_key].duplicated(keep="last")
+    if duplicated.any():
+        log_activity(f"🔗 {int(duplicated.sum())} repeated {platform} post URLs collapsed for the SNA join")
+        lookup = lookup[~duplicated]
+    return lookup
+
+def join_sna(platform, lookup, relations):
+    """Join relations to a sna_lookup(); returns (SNA frame, post URL per relation)"""
+    adapter = PLATFORM_ADAPTERS[platform]
+    join = adapter["join"]
+    if adapter.get("relation_renames"):
+        relations = relations.rename(columns=adapter["relation_renames"])
+
+    # sna_lookup menaruh kolom key post di posisi pertama
+    merged = relations.merge(lookup, left_on=join["relation_key"], right_on=lookup.columns[0], how="left")
+    # Cek many-to-one: left join tanpa baris tambahan (lebih murah dari merge(validate=...))
+    if len(merged) != len(relations):
+        raise ValueError(f"{platform} SNA join is not many-to-one: "
+                         f"{len(relations)} relations became {len(merged)} rows")
+    return map_columns(merged, platform, adapter["sna"]), merged[join["relation_key"]]
+
+def sna_frame(platform, posts, relations):
+    """Join relations to their posts; returns (SNA frame, post URL per relation)"""
+    return join_sna(platform, sna_lookup(platform, posts), relations)
+
+# Kolom teks yang tidak ditulis ke dashboardsna di mode normalized_sna; content_text
+# hanya dikosongkan untuk relasi yang post-nya ada di dashboardsentimen
+SNA_TEXT_COLUMNS = ["content_original"] + TOKEN_COLUMNS
+
+def reuse_cleaned_post_text(sna, sna_urls, sentimen):
+    """SNA frame keyed by post_url, with the post text taken from the cleaned sentimen frame
+
+    Relations of posts that are not in the sentimen frame (dropped as duplicate
+    text, or processed by an earlier incremental run) have their own text cleaned.
+    """
+    sna = sna.copy()
+    sna["post_url"] = sna_urls.to_numpy()
+    cleaned = sentimen.drop_duplicates("post_url", keep="last").set_index("post_url")["content_text"]
+    text = sna["post_url"].map(cleaned)
+
+    missing = text.isna() & sna["content_text"].notna()
+    if missing.any():
+        text[missing] = clean_text_column(sna.loc[missing, "content_text"])
+    log_activity(f"♻️ Reused cleaned post text for {int((~missing).sum())}/{len(sna)} relations")
+    sna["content_text"] = text.where(text.notna(), '')
+    return sna
+
+def normalized_sna_frame(dashboardsna, dashboardsentimen):
+    """dashboardsna without post text where dashboardsentimen has the post
+
+    Relations reference dashboardsentimen by (platform, post_url). Posts that are
+    not in the final sentimen output (e.g. dropped as duplicate or empty text)
+    keep their content_text, so no relation is left without its post text.
+    """
+    dashboardsna = dashboardsna.drop(columns=SNA_TEXT_COLUMNS, errors="ignore")
+    if "content_text" not in dashboardsna.columns:
+        return dashboardsna
+
+    posts = pd.MultiIndex.from_frame(dashboardsentimen[["platform", "post_url"]])
+    referenced = pd.MultiIndex.from_frame(dashboardsna[["platform", "post_url"]]).isin(posts)
+    dashboardsna = dashboardsna.copy()
+    dashboardsna.loc[referenced, "content_text"] = ''
+    if (~referenced).any():
+        log_activity(f"🔗 {int((~referenced).sum())} SNA relations keep their post text "
+                     f"(post not in dashboardsentimen)")
+    return dashboardsna
+
+def process_platform(platform, files, manifest=None):
+    """Load, map and preprocess one platform; returns (sentimen, sna, new manifest keys or None)"""
+    adapter = PLATFORM_ADAPTERS[platform]
+    log_activity(f"{adapter['icon']} Processing {adapter['name']} data...")
+
+    posts = pd.read_csv(files[f"{platform}_sentimen"])
+    relations = pd.read_csv(files[f"{platform}_sna"])
+
+    sentimen = sentimen_frame(platform, posts)
+    sna, sna_urls = sna_frame(platform, posts, relations)
+
+    new_keys = {"sentimen": set(), "sna": set()} if manifest is not None else None
+    sentimen, sna = skip_processed(platform, sentimen, sna, sna_urls, manifest, new_keys)
+
+    # Preprocessing with Sastrawi
+    log_activity(f"🔤 Applying Sastrawi preprocessing to {adapter['name']} data...")
+    sentimen = preprocess_dataframe(sentimen, collect_stats=True)
+    if CONFIG["normalized_sna"]["enabled"]:
+        sna = reuse_cleaned_post_text(sna, sna_urls.loc[sna.index], sentimen)
+        sna = preprocess_dataframe(sna, normalize_metrics=False, clean_text=False)
+    else:
+        sna = preprocess_dataframe(sna, normalize_metrics=False)
+
+    return sentimen, sna, new_keys
+
+def _init_platform_worker(settings):
+    """Pool initializer: same CONFIG as the parent, fresh cache connections"""
+    global _STEM_CACHE, _CLEAN_TEXT_CACHE
+    CONFIG.update(settings)
+    # Koneksi SQLite milik parent tidak boleh dipakai ulang di proses anak
+    _STEM_CACHE = None
+    _CLEAN_TEXT_CACHE = None
+    _take_worker_profile()
+    _take_worker_stats()
+
+def _process_platform_job(job):
+    platform, files, manifest = job
+    return process_platform(platform, files, manifest), _take_worker_profile(), _take_worker_stats()
+
+def process_platforms(files, manifest=None):
+    """Process every registered platform, concurrently on a process pool when enabled
+
+    Returns a list of (sentimen, sna, new_keys) in PLATFORM_ADAPTERS order.
+    """
+    platforms = list(PLATFORM_ADAPTERS)
+    settings = CONFIG["concurrent_platforms"]
+    workers = min(settings["workers"] or os.cpu_count() or 1, len(platforms))
+
+    # Cleaning paralel sudah memakai semua core, jadi platform diproses berurutan
+    if not settings["enabled"] or workers < 2 or CONFIG["parallel"]["enabled"]:
+        return [process_platform(platform, files, manifest) for platform in platforms]
+
+    log_activity(f"⚡ Processing {len(platforms)} platforms on {workers} workers")
+    # Stopword cukup di-load sekali di sini; worker hasil fork mewarisinya
+    if CONFIG["text_preprocessing"]["remove_stopwords"]:
+        get_stopword_registry()
+    mp_context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+    jobs = [(platform, files, manifest) for platform in platforms]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                             initializer=_init_platform_worker, initargs=(copy.deepcopy(CONFIG),)) as executor:
+        results = []
+        for result, worker_profile, worker_stats in executor.map(_process_platform_job, jobs):
+            results.append(result)
+            merge_worker_profile(worker_profile)
+            merge_worker_stats(worker_stats)
+        return results
 
 # ==============================
-# 4. Instagram Processing
+# GABUNG, RINGKASAN & SIMPAN
 # ==============================
-log_activity("📷 Processing Instagram data...")
-
-ig = pd.read_csv(files["instagram_sentimen"])
-ig_sna = pd.read_csv(files["instagram_sna"])
-
-# Samakan nama kolom scraped_at → extracted_at (biar konsisten)
-if "scraped_at" in ig_sna.columns:
-    ig_sna = ig_sna.rename(columns={"scraped_at": "extracted_at"})
-
-ig_merged = ig_sna.merge(ig, left_on="post_url", right_on="url", how="left")
-
-instagram_sentimen = pd.DataFrame({
-    "platform": "instagram",
-    "author": ig["owner_username"],
-    "author_username": ig["owner_fullname"],
-    "content_text": get_column(ig, "caption", ["text", "content"]),
-    "post_url": ig["url"],
-    "timestamp": get_column(ig, "formatted_date", ["timestamp"]),
-    "likes": ig["likes_count"],
-    "shares": ig["reshare_count"],
-    "comments": ig["comments_count"],
-    "views": ig["video_play_count"],
-    "hashtags": ig["hashtags"],
-    "mentions": ig["mentions"],
-    "scraped_at": ig["scraped_at"]
-})
-
-instagram_sna = pd.DataFrame({
-    "platform": "instagram",
-    "content_text": get_column(ig_merged, "caption", ["caption_x","caption_y","text"]),
-    "source": ig_merged["source"],
-    "target": ig_merged["target"],
-    "relation": ig_merged["relation"],
-    "timestamp": ig_merged["timestamp_x"] if "timestamp_x" in ig_merged.columns else ig_merged["timestamp"],
-    "scraped_at": get_column(ig_merged, "scraped_at_x", ["scraped_at", "extracted_at"])
-})
-
-# Preprocessing Instagram data with Sastrawi
-log_activity("🔤 Applying Sastrawi preprocessing to Instagram data...")
-instagram_sentimen = preprocess_dataframe(instagram_sentimen)
-instagram_sna = preprocess_dataframe(instagram_sna, normalize_metrics=False)
+def combine_platforms(sentimen_frames, sna_frames):
+    """Concatenate the per-platform frames and apply the final dashboard cleaning"""
+    log_activity("🔗 Combining all platforms...")
+
+    # Frame kosong (mis. semua baris sudah diproses di mode incremental) tidak ikut digabung
+    # supaya tidak mengubah dtype kolom metrik jadi float
+    dashboardsentimen = pd.concat(
+        [f for f in sentimen_frames if not f.empty] or sentimen_frames,
+        ignore_index=True
+    )
+
+    dashboardsentimen = final_clean_sentimen(dashboardsentimen)
+
+    dashboardsna = pd.concat(
+        [f for f in sna_frames if not f.empty] or sna_frames,
+        ignore_index=True
+    )
+    dashboardsna = final_clean_sna(dashboardsna)
+    return dashboardsentimen, dashboardsna
+
+def final_clean_sentimen(dashboardsentimen):
+    """Final cleaning untuk data sentimen"""
+    dashboardsentimen = dashboardsentimen.dropna(subset=["content_text"])
+    dashboardsentimen = dashboardsentimen[dashboardsentimen["content_text"].str.strip() != ""]
+    return dashboardsentimen[dashboardsentimen["content_text"] != "[cleaned_empty]"]
+
+def final_clean_sna(dashboardsna):
+    """Final cleaning untuk data SNA"""
+    dashboardsna = dashboardsna.dropna(subset=["source", "target", "relation"])
+    return dashboardsna[
+        (dashboardsna["source"].str.strip() != "") &
+        (dashboardsna["target"].str.strip() != "") &
+        (dashboardsna["relation"].str.strip() != "")
+    ]
+
+def show_data_summary(sentimen_count, sna_count, platform_counts):
+    """Log record counts and the preprocessing configuration"""
+    log_activity("📊 Data Summary:")
+    log_activity(f"   Total Sentimen Records: {sentimen_count}")
+    log_activity(f"   Total SNA Records: {sna_count}")
+    log_activity(f"   Platform Distribution (Sentimen):")
+    for platform in platform_counts.items():
+        log_activity(f"     - {platform[0]}: {platform[1]} records")
+
+    log_activity(f"\n🔧 Preprocessing Configuration:")
+    log_activity(f"   - Sastrawi Stemming: {'✅ Enabled' if CONFIG['text_preprocessing']['use_sastrawi_stemming'] and SASTRAWI_AVAILABLE else '❌ Disabled'}")
+    log_activity(f"   - Sastrawi Stopwords: {'✅ Enabled' if CONFIG['text_preprocessing']['use_sastrawi_stopwords'] and SASTRAWI_AVAILABLE else '❌ Disabled'}")
+    log_activity(f"   - Combined Stopwords: {'✅ Enabled' if CONFIG['text_preprocessing']['combine_stopwords'] else '❌ Disabled'}")
+
+def save_outputs(dashboardsentimen, dashboardsna, paths):
+    """Write the dashboard CSVs and the preprocessing report"""
+    log_activity("💾 Saving processed files...")
+
+    dashboardsentimen.drop(columns=TOKEN_COLUMNS, errors="ignore").to_csv(
+        paths["dashboardsentimen"], index=False, date_format=DATETIME_OUTPUT_FORMAT
+    )
+    dashboardsna.drop(columns=TOKEN_COLUMNS, errors="ignore").to_csv(
+        paths["dashboardsna"], index=False, date_format=DATETIME_OUTPUT_FORMAT
+    )
+
+    if CONFIG["parquet"]["enabled"]:
+        save_parquet_outputs(paths, {"dashboardsentimen": dashboardsentimen, "dashboardsna": dashboardsna})
+
+    save_preprocessing_report(len(dashboardsentimen), dashboardsentimen['platform'].value_counts(), paths)
+
+def save_preprocessing_report(total_records, platform_counts, paths):
+    """Save preprocessing report (platform_counts: value_counts of the sentimen platform column)"""
+    stats = get_stats()
+    stats.save(paths["preprocessing_stats"])
+
+    if SASTRAWI_AVAILABLE:
+        preprocessing_report = {
+            'total_records_processed': total_records,
+            'sastrawi_enabled': True,
+            'stemming_applied': CONFIG['text_preprocessing']['use_sastrawi_stemming'],
+            'stopwords_combined': CONFIG['text_preprocessing']['combine_stopwords'],
+            'platform_distribution': dict(platform_counts),
+            **stats.summary()
+        }
+
+        pd.DataFrame([preprocessing_report]).to_csv(paths["preprocessing_report"], index=False)
+        log_activity("   📊 preprocessing_report.csv - Processing statistics")
+
+    profile = get_profile()
+    if profile is not None:
+        save_preprocessing_profile(profile, paths["preprocessing_profile"])
 
 # ==============================
-# 5. Facebook Processing
+# STREAMING MODE
 # ==============================
-log_activity("📘 Processing Facebook data...")
-
-fb = pd.read_csv(files["facebook_sentimen"])
-fb_sna = pd.read_csv(files["facebook_sna"])
-
-fb_merged = fb_sna.merge(fb, left_on="post_url", right_on="facebookUrl", how="left")
-
-fb_merged = fb_sna.merge(
-    fb,
-    left_on="post_url",
-    right_on="facebookUrl" if "facebookUrl" in fb.columns else "url",
-    how="left"
-)
-
-facebook_sentimen = pd.DataFrame({
-    "platform": "facebook",
-    "author": get_column(fb, "pageName", ["user"]),
-    "author_username": get_column(fb, "user", ["pageName"]),
-    "content_text": get_column(fb, "text", []),
-    "post_url": get_column(fb, "facebookUrl", ["url", "topLevelUrl", "link"]),
-    "timestamp": get_column(fb, "timestamp", ["time"]),
-    "likes": get_column(fb, "likes", []),
-    "shares": get_column(fb, "shares", []),
-    "comments": get_column(fb, "comments", []),
-    "views": get_column(fb, "viewsCount", []),
-    "hashtags": get_column(fb, "hashtags", []),
-    "mentions": get_column(fb, "mentions", []),
-    "scraped_at": get_column(fb, "scraped_at", [])
-})
-
-facebook_sna = pd.DataFrame({
-    "platform": "facebook",
-    "content_text": get_column(fb_merged, "text", []),
-    "source": fb_merged["source"],
-    "target": fb_merged["target"],
-    "relation": fb_merged["relation"],
-    "timestamp": get_column(fb_merged, "timestamp_x", ["timestamp", "time"]),
-    "scraped_at": get_column(fb_merged, "scraped_at_x", ["scraped_at_y","scraped_at"])
-})
-
-# Preprocessing Facebook data with Sastrawi
-log_activity("🔤 Applying Sastrawi preprocessing to Facebook data...")
-facebook_sentimen = preprocess_dataframe(facebook_sentimen)
-facebook_sna = preprocess_dataframe(facebook_sna, normalize_metrics=False)
+def read_sna_lookup(platform, posts_path, relations_path, chunksize):
+    """Post columns needed by the SNA join, only for the posts its relations reference
+
+    Both files are read in chunks: first the post URLs of the relations, then the
+    post file, keeping the matching rows. Memory grows with the referenced posts,
+    not with the whole post file.
+    """
+    join = PLATFORM_ADAPTERS[platform]["join"]
+    urls = set()
+    for relations in pd.read_csv(relations_path, usecols=[join["relation_key"]], chunksize=chunksize):
+        urls.update(relations[join["relation_key"]].dropna())
+
+    columns = sna_lookup_columns(platform)
+    parts = []
+    for posts in pd.read_csv(posts_path, usecols=lambda c: c in columns, chunksize=chunksize):
+        post_key = next((key for key in join["post_key"] if key in posts.columns), None)
+        parts.append(posts[posts[post_key].isin(urls)] if post_key else posts)
+    if not parts:
+        return pd.read_csv(posts_path, usecols=lambda c: c in columns, nrows=0)
+    return pd.concat(parts, ignore_index=True)
+
+def _stream_preprocess(frames, tmp_path, normalize_metrics, collect_stats=False):
+    """Pass 1: preprocess each chunk into tmp_path; returns the row numbers that survive deduplication"""
+    last_row = {}
+    row = 0
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        for frame in frames:
+            frame = preprocess_dataframe(frame, normalize_metrics=normalize_metrics, drop_duplicates=False,
+                                         collect_stats=collect_stats)
+            if frame.empty:
+                continue
+            frame = frame.drop(columns=TOKEN_COLUMNS, errors="ignore")
+            # Sama dengan drop_duplicates(keep='last'): baris terakhir per teks yang menang.
+            # Yang disimpan digest blake2b teks (bukan teksnya) supaya memori tetap kecil;
+            # hash() bawaan bisa bentrok dan berubah antar proses
+            for text in frame["content_text"]:
+                last_row[hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()] = row
+                row += 1
+            frame.to_csv(f, header=f.tell() == 0, index=False, date_format=DATETIME_OUTPUT_FORMAT)
+    return set(last_row.values())
+
+def _stream_write(tmp_path, keep_rows, out, final_clean, chunksize, platform_counts=None, collect_stats=False,
+                  drop_columns=(), written_urls=None, blank_text_urls=None):
+    """Pass 2: copy the surviving rows of tmp_path to the output file; returns rows written
+
+    written_urls collects the post_url of every written row; rows whose post_url
+    is in blank_text_urls are written with an empty content_text.
+    """
+    if not keep_rows:
+        return 0
+
+    written = 0
+    start = 0
+    # dtype=str: nilai disalin apa adanya, tidak di-parse ulang
+    for chunk in pd.read_csv(tmp_path, chunksize=chunksize, dtype=str, keep_default_na=False):
+        keep = [r in keep_rows for r in range(start, start + len(chunk))]
+        start += len(chunk)
+        chunk = final_clean(chunk[keep])
+        if chunk.empty:
+            continue
+        if collect_stats:
+            get_stats().update(chunk["content_original"], chunk["content_text"])
+        if CONFIG["compact"]["enabled"] and not CONFIG["compact"]["keep_content_original"]:
+            chunk = chunk.drop(columns=["content_original"], errors="ignore")
+        if written_urls is not None:
+            written_urls.update(chunk["post_url"])
+        if blank_text_urls is not None:
+            chunk = chunk.copy()
+            chunk.loc[chunk["post_url"].isin(blank_text_urls), "content_text"] = ''
+        if drop_columns:
+            chunk = chunk.drop(columns=list(drop_columns), errors="ignore")
+        chunk.to_csv(out, header=out.tell() == 0, index=False)
+        written += len(chunk)
+        if platform_counts is not None:
+            platform_counts.update(chunk["platform"])
+    return written
+
+def _stream_sna_frame(platform, lookup, relations):
+    """One SNA chunk; keyed by post_url in normalized mode (its text is still needed for dedup)"""
+    sna, sna_urls = join_sna(platform, lookup, relations)
+    if CONFIG["normalized_sna"]["enabled"]:
+        sna["post_url"] = sna_urls.to_numpy()
+    return sna
+
+def stream_dashboard_rows(frames, out, final_clean, normalize_metrics, chunksize, platform_counts=None,
+                          collect_stats=False, drop_columns=(), written_urls=None, blank_text_urls=None):
+    """Preprocess a stream of mapped chunks and append the deduplicated, cleaned rows to out"""
+    fd, tmp_path = tempfile.mkstemp(suffix=".csv", dir=os.path.dirname(os.path.abspath(out.name)))
+    os.close(fd)
+    try:
+        keep_rows = _stream_preprocess(frames, tmp_path, normalize_metrics, collect_stats)
+        return _stream_write(tmp_path, keep_rows, out, final_clean, chunksize, platform_counts, collect_stats,
+                             drop_columns, written_urls, blank_text_urls)
+    finally:
+        os.remove(tmp_path)
+
+def run_transform_streaming(paths):
+    """Streaming variant of run_transform: bounded memory, outputs written chunk by chunk"""
+    chunksize = CONFIG["streaming"]["chunksize"]
+    if CONFIG["incremental"]["enabled"]:
+        log_activity("⚠️ Incremental mode is not supported with streaming, rebuilding all records")
+    if CONFIG["tokens"]["enabled"]:
+        log_activity("⚠️ Token columns are not kept in streaming mode (outputs are only written to disk)")
+
+    platform_counts = Counter()
+    totals = {"sentimen": 0, "sna": 0}
+    tmp_outputs = {kind: f"{paths[f'dashboard{kind}']}.tmp" for kind in totals}
+
+    normalized = CONFIG["normalized_sna"]["enabled"]
+    with open(tmp_outputs["sentimen"], "w", encoding="utf-8", newline="") as sentimen_out, \
+            open(tmp_outputs["sna"], "w", encoding="utf-8", newline="") as sna_out:
+        for platform in PLATFORM_ADAPTERS:
+            log_activity(f"🌊 Streaming {platform} data in chunks of {chunksize} rows...")
+            posts_path = paths[f"{platform}_sentimen"]
+            # normalized_sna: teks relasi hanya dikosongkan jika post-nya tertulis di dashboardsentimen
+            sentimen_urls = set() if normalized else None
+
+            frames = (sentimen_frame(platform, posts) for posts in pd.read_csv(posts_path, chunksize=chunksize))
+            totals["sentimen"] += stream_dashboard_rows(
+                frames, sentimen_out, final_clean_sentimen, True, chunksize, platform_counts, collect_stats=True,
+                written_urls=sentimen_urls
+            )
+
+            lookup = sna_lookup(platform, read_sna_lookup(platform, posts_path, paths[f"{platform}_sna"], chunksize))
+            frames = (
+                _stream_sna_frame(platform, lookup, relations)
+                for relations in pd.read_csv(paths[f"{platform}_sna"], chunksize=chunksize)
+            )
+            totals["sna"] += stream_dashboard_rows(
+                frames, sna_out, final_clean_sna, False, chunksize,
+                drop_columns=SNA_TEXT_COLUMNS if normalized else (), blank_text_urls=sentimen_urls
+            )
+            del lookup, sentimen_urls
+
+    log_activity("💾 Saving processed files...")
+    for kind, tmp_path in tmp_outputs.items():
+        os.replace(tmp_path, paths[f"dashboard{kind}"])
+    if CONFIG["parquet"]["enabled"]:
+        save_parquet_outputs(paths, chunksize=chunksize)
+
+    platform_counts = pd.Series(platform_counts, dtype="int64").sort_values(ascending=False)
+    if CONFIG["near_duplicates"]["enabled"]:
+        log_activity("🧬 Near-duplicate detection needs the whole frame and is skipped in streaming mode")
+    show_preprocessing_stats(get_stats(), sample_size=3)
+    show_data_summary(totals["sentimen"], totals["sna"], platform_counts)
+    save_preprocessing_report(totals["sentimen"], platform_counts, paths)
 
 # ==============================
-# 6. Gabung Semua Platform
+# PARQUET OUTPUT
 # ==============================
-log_activity("🔗 Combining all platforms...")
-
-dashboardsentimen = pd.concat(
-    [twitter_sentimen, tiktok_sentimen, instagram_sentimen, facebook_sentimen],
-    ignore_index=True
-)
-
-# Final cleaning untuk data sentimen
-dashboardsentimen = dashboardsentimen.dropna(subset=["content_text"])
-dashboardsentimen = dashboardsentimen[dashboardsentimen["content_text"].str.strip() != ""]
-dashboardsentimen = dashboardsentimen[dashboardsentimen["content_text"] != "[cleaned_empty]"]
-
-dashboardsna = pd.concat(
-    [twitter_sna, tiktok_sna, instagram_sna, facebook_sna],
-    ignore_index=True
-)
-
-# Final cleaning untuk data SNA
-dashboardsna = dashboardsna.dropna(subset=["source", "target", "relation"])
-dashboardsna = dashboardsna[
-    (dashboardsna["source"].str.strip() != "") &
-    (dashboardsna["target"].str.strip() != "") &
-    (dashboardsna["relation"].str.strip() != "")
-]
+# Parquet bersifat opsional: butuh pyarrow (pip install pyarrow)
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+PARQUET_PARTITION_COLUMNS = ["platform", "date"]
+CATEGORY_COLUMNS = ["relation"]
+
+def typed_dashboard_frame(df):
+    """Cast a dashboard frame (in memory or read back from CSV) to the typed Parquet schema"""
+    df = df.copy()
+    for col in df.columns:
+        if col in METRIC_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+        elif col in DATETIME_COLUMNS:
+            df[col] = normalize_datetime_column(df[col])[0]
+        elif col in CATEGORY_COLUMNS:
+            df[col] = df[col].astype("category")
+        elif col in TOKEN_COLUMNS:
+            continue
+        else:
+            # Kolom teks selalu string, supaya schema sama di semua file partisi
+            df[col] = df[col].astype("string")
+
+    # Partisi tanggal (UTC) dari timestamp post, fallback ke scraped_at
+    date_format = CONFIG["parquet"]["date_partition_format"]
+    dates = df["timestamp"].dt.strftime(date_format)
+    if "scraped_at" in df.columns:
+        dates = dates.fillna(df["scraped_at"].dt.strftime(date_format))
+    df["date"] = dates.fillna("unknown")
+    return df
+
+def write_parquet_dataset(frames, path):
+    """Write dashboard frames as a Parquet dataset partitioned by platform/date; returns rows written"""
+    tmp_path = f"{path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+
+    rows = 0
+    for frame in frames:
+        if frame.empty:
+            continue
+        typed_dashboard_frame(frame).to_parquet(
+            tmp_path,
+            engine="pyarrow",
+            partition_cols=PARQUET_PARTITION_COLUMNS,
+            compression=CONFIG["parquet"]["compression"],
+            index=False
+        )
+        rows += len(frame)
+
+    # Dataset lama diganti seluruhnya, bukan ditambah file baru
+    shutil.rmtree(path, ignore_errors=True)
+    if rows:
+        os.replace(tmp_path, path)
+    return rows
+
+def save_parquet_outputs(paths, frames=None, chunksize=None):
+    """Write the Parquet datasets from in-memory frames, or from the dashboard CSVs chunk by chunk"""
+    if not PYARROW_AVAILABLE:
+        log_activity("⚠️ Parquet output skipped: pyarrow is not installed")
+        return
+
+    for kind in ("dashboardsentimen", "dashboardsna"):
+        if frames is not None:
+            source = [frames[kind]]
+        else:
+            source = pd.read_csv(paths[kind], chunksize=chunksize, dtype=str)
+        rows = write_parquet_dataset(source, paths[f"{kind}_parquet"])
+        log_activity(f"   🗂️ {os.path.basename(paths[f'{kind}_parquet'])}/ - {rows} rows, "
+                     f"partitioned by {'/'.join(PARQUET_PARTITION_COLUMNS)}")
+
+def read_dashboard_parquet(path, columns=None, platforms=None, start_date=None, end_date=None):
+    """Read a dashboard Parquet dataset, loading only the requested columns and partitions
+
+    start_date/end_date (inclusive, UTC) prune the date partitions and filter on timestamp.
+    """
+    filters = []
+    if platforms:
+        filters.append(("platform", "in", list(platforms)))
+
+    date_format = CONFIG["parquet"]["date_partition_format"]
+    if start_date:
+        start = pd.Timestamp(start_date, tz="UTC")
+        filters += [("date", ">=", start.strftime(date_format)), ("date", "!=", "unknown"),
+                    ("timestamp", ">=", start)]
+    if end_date:
+        end = pd.Timestamp(end_date, tz="UTC")
+        if len(str(end_date)) <= 10:
+            # Tanggal saja: seluruh hari itu ikut
+            end += pd.Timedelta(days=1) - pd.Timedelta(1, "ns")
+        filters += [("date", "<=", end.strftime(date_format)), ("timestamp", "<=", end)]
+    return pd.read_parquet(path, engine="pyarrow", columns=columns, filters=filters or None)
+
+def benchmark_dashboard_reads(paths, repeat=3, columns=("platform", "content_text", "timestamp", "likes"),
+                              platform="twitter"):
+    """Time dashboard reads from CSV vs Parquet: full table, and a few columns of one platform"""
+    if not PYARROW_AVAILABLE:
+        log_activity("⚠️ Read benchmark needs pyarrow")
+        return {}
+
+    columns = list(columns)
+    csv_path, parquet_path = paths["dashboardsentimen"], paths["dashboardsentimen_parquet"]
+
+    def csv_subset():
+        df = pd.read_csv(csv_path, usecols=columns, parse_dates=["timestamp"])
+        return df[df["platform"] == platform]
+
+    cases = {
+        "csv full": lambda: pd.read_csv(csv_path, parse_dates=DATETIME_COLUMNS),
+        "parquet full": lambda: read_dashboard_parquet(parquet_path),
+        f"csv {len(columns)} columns, {platform}": csv_subset,
+        f"parquet {len(columns)} columns, {platform}": lambda: read_dashboard_parquet(
+            parquet_path, columns=columns, platforms=[platform]
+        )
+    }
+
+    log_activity(f"⏱️ Dashboard read benchmark (best of {repeat}):")
+    results = {}
+    for name, read in cases.items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows = len(read())
+            timings.append(time.perf_counter() - start)
+        results[name] = {"seconds": min(timings), "rows": rows}
+        log_activity(f"   {name}: {min(timings) * 1000:.1f} ms ({rows} rows)")
+    return results
 
 # ==============================
-# 7. Show Preprocessing Statistics
+# COMPACT MODE
 # ==============================
-if len(dashboardsentimen) > 0 and 'content_original' in dashboardsentimen.columns:
-    show_preprocessing_stats(
-        dashboardsentimen['content_original'], 
-        dashboardsentimen['content_text'], 
-        sample_size=3
-    )
+# Kolom teks berulang yang disimpan sebagai category (kalau nilai uniknya cukup sedikit)
+COMPACT_CATEGORY_COLUMNS = ["platform", "relation", "author", "author_username", "source", "target"]
+
+def _downcast_int(series):
+    """Smallest nullable integer dtype that holds every value of the series"""
+    values = series.dropna()
+    low, high = (values.min(), values.max()) if len(values) else (0, 0)
+    for dtype in ("Int8", "Int16", "Int32"):
+        info = np.iinfo(dtype.lower())
+        if info.min <= low and high <= info.max:
+            return series.astype(dtype)
+    return series.astype("Int64")
+
+def compact_dashboard_frame(df, keep_content_original=None):
+    """Shrink a dashboard frame: categoricals, downcast metrics, datetime64, optional content_original"""
+    settings = CONFIG["compact"]
+    if keep_content_original is None:
+        keep_content_original = settings["keep_content_original"]
+
+    df = df.copy()
+    if not keep_content_original and "content_original" in df.columns:
+        df = df.drop(columns=["content_original"])
+
+    for col in df.columns:
+        if col in METRIC_COLUMNS:
+            df[col] = _downcast_int(pd.to_numeric(df[col], errors="coerce").astype("Int64"))
+        elif col in DATETIME_COLUMNS:
+            df[col] = normalize_datetime_column(df[col])[0]
+        elif col in COMPACT_CATEGORY_COLUMNS and len(df):
+            if df[col].nunique() <= settings["category_max_ratio"] * len(df):
+                df[col] = df[col].astype("category")
+    return df
+
+def memory_usage_report(before, after, name):
+    """Log the per-column and total memory footprint of a frame before/after compaction"""
+    report = pd.DataFrame({
+        "before_bytes": before.memory_usage(deep=True, index=False),
+        "after_bytes": after.memory_usage(deep=True, index=False),
+        "dtype": after.dtypes.astype(str)
+    })
+    report["after_bytes"] = report["after_bytes"].fillna(0).astype("int64")
+    report["dtype"] = report["dtype"].fillna("dropped")
+
+    total_before, total_after = report["before_bytes"].sum(), report["after_bytes"].sum()
+    log_activity(f"🧮 {name}: {total_before / 1e6:.2f} MB → {total_after / 1e6:.2f} MB "
+                 f"({1 - total_after / max(total_before, 1):.0%} smaller)")
+    for col, row in report.sort_values("before_bytes", ascending=False).iterrows():
+        log_activity(f"   - {col}: {row['before_bytes'] / 1e6:.2f} → {row['after_bytes'] / 1e6:.2f} MB ({row['dtype']})")
+    return report
+
+def load_dashboard_csv(path, compact=True):
+    """Read a dashboard CSV back with proper dtypes (compact by default) for analysis"""
+    df = pd.read_csv(path)
+    return compact_dashboard_frame(df) if compact else df
 
 # ==============================
-# 8. Data Summary
+# PIPELINE
 # ==============================
-log_activity("📊 Data Summary:")
-log_activity(f"   Total Sentimen Records: {len(dashboardsentimen)}")
-log_activity(f"   Total SNA Records: {len(dashboardsna)}")
-log_activity(f"   Platform Distribution (Sentimen):")
-for platform in dashboardsentimen['platform'].value_counts().items():
-    log_activity(f"     - {platform[0]}: {platform[1]} records")
-
-log_activity(f"\n🔧 Preprocessing Configuration:")
-log_activity(f"   - Sastrawi Stemming: {'✅ Enabled' if CONFIG['text_preprocessing']['use_sastrawi_stemming'] and SASTRAWI_AVAILABLE else '❌ Disabled'}")
-log_activity(f"   - Sastrawi Stopwords: {'✅ Enabled' if CONFIG['text_preprocessing']['use_sastrawi_stopwords'] and SASTRAWI_AVAILABLE else '❌ Disabled'}")
-log_activity(f"   - Combined Stopwords: {'✅ Enabled' if CONFIG['text_preprocessing']['combine_stopwords'] else '❌ Disabled'}")
+INPUT_FILES = {
+    "twitter_sentimen": "twitter_politik_indonesia_auto.csv",
+    "twitter_sna": "twitter_sna_relations.csv",
+    "tiktok_sentimen": "tiktok_politik_auto.csv",
+    "tiktok_sna": "tiktok_sna_relations.csv",
+    "instagram_sentimen": "instagram_data_cleaned.csv",
+    "instagram_sna": "instagram_sna_data.csv",
+    "facebook_sentimen": "facebook_politik_enhanced.csv",
+    "facebook_sna": "facebook_sna_relation.csv"
+}
+
+OUTPUT_FILES = {
+    "dashboardsentimen": "dashboardsentimen.csv",
+    "dashboardsna": "dashboardsna.csv",
+    "preprocessing_report": "preprocessing_report.csv",
+    "manifest": "transform_manifest.json",
+    "dashboardsentimen_parquet": "dashboardsentimen_parquet",
+    "dashboardsna_parquet": "dashboardsna_parquet",
+    "vocabulary": "token_vocabulary.json",
+    "preprocessing_profile": "preprocessing_profile.json",
+    "preprocessing_stats": "preprocessing_stats.json"
+}
+
+def default_paths(input_dir="/content", output_dir=None):
+    """Input and output paths keyed like INPUT_FILES/OUTPUT_FILES"""
+    output_dir = output_dir or input_dir
+    paths = {key: os.path.join(input_dir, name) for key, name in INPUT_FILES.items()}
+    paths.update({key: os.path.join(output_dir, name) for key, name in OUTPUT_FILES.items()})
+    return paths
+
+def apply_options(options, config=None):
+    """Merge option overrides into CONFIG (nested dicts are merged, not replaced)"""
+    if config is None:
+        config = CONFIG
+    for key, value in options.items():
+        if isinstance(value, dict) and isinstance(config.get(key), dict):
+            apply_options(value, config[key])
+        else:
+            config[key] = value
+
+def run_transform(paths=None, options=None):
+    """Run the whole Transform pipeline and return (dashboardsentimen, dashboardsna)
+
+    In streaming mode the outputs are only written to disk and None is returned.
+    Options only apply to this run: CONFIG is restored when it returns.
+    """
+    paths = {**default_paths(), **(paths or {})}
+    saved_config = copy.deepcopy(CONFIG)
+    try:
+        if options:
+            apply_options(options)
+        if CONFIG["cache_dir"] is None:
+            CONFIG["cache_dir"] = os.path.join(os.path.dirname(os.path.abspath(paths["dashboardsentimen"])),
+                                               ".transform_cache")
+        return _run_transform(paths)
+    finally:
+        # Dikembalikan in-place: modul lain memegang referensi ke CONFIG yang sama
+        CONFIG.clear()
+        CONFIG.update(saved_config)
+
+def _run_transform(paths):
+    reset_profile()
+    reset_stats()
+
+    log_activity("📁 Loading data files...")
+    log_activity(f"🔧 Sastrawi integration: {'Enabled' if init_sastrawi() else 'Disabled'}")
+
+    if CONFIG["streaming"]["enabled"]:
+        run_transform_streaming(paths)
+        log_activity("✅ Files successfully created:")
+        log_activity("   📄 dashboardsentimen.csv - Enhanced preprocessed sentiment data")
+        log_activity("   📄 dashboardsna.csv - Enhanced preprocessed SNA data")
+        log_activity("🎉 Enhanced processing with Sastrawi complete!")
+        return None
+
+    manifest = new_keys = None
+    if CONFIG["incremental"]["enabled"]:
+        run_fingerprint = preprocessing_fingerprint()
+        manifest = load_manifest(
+            paths["manifest"], run_fingerprint,
+            [paths["dashboardsentimen"], paths["dashboardsna"]]
+        )
+        new_keys = {"sentimen": set(), "sna": set()}
+        log_activity(f"🔁 Incremental mode: {len(manifest['sentimen'])} sentimen + "
+                     f"{len(manifest['sna'])} SNA records already processed")
+        # Statistik run sebelumnya dilanjutkan, output lama tidak perlu dibaca ulang
+        if manifest["sentimen"]:
+            previous = PreprocessingStats.load(paths["preprocessing_stats"])
+            if previous is None:
+                log_activity("⚠️ No statistics from earlier runs, the report covers this run's records only")
+            reset_stats(previous)
+
+    platform_results = process_platforms(paths, manifest)
+    dashboardsentimen, dashboardsna = combine_platforms(
+        [sentimen for sentimen, _, _ in platform_results],
+        [sna for _, sna, _ in platform_results]
+    )
+    if manifest is not None:
+        for _, _, platform_keys in platform_results:
+            for kind in new_keys:
+                new_keys[kind].update(platform_keys[kind])
+
+    # Incremental: gabungkan baris baru dengan output run sebelumnya
+    if manifest is not None:
+        log_activity(f"🔁 Merging {len(dashboardsentimen)} new sentimen + {len(dashboardsna)} new SNA records...")
+        dashboardsentimen = merge_incremental(
+            paths["dashboardsentimen"], dashboardsentimen,
+            dedup_on=["platform", "content_text"], replace_on=["platform", "post_url"]
+        )
+        # Output normalized_sna tidak punya teks post, relasi di-dedup per post
+        dashboardsna = merge_incremental(
+            paths["dashboardsna"], dashboardsna,
+            dedup_on=["platform", "post_url"] if CONFIG["normalized_sna"]["enabled"] else ["platform", "content_text"]
+        )
+    if CONFIG["normalized_sna"]["enabled"]:
+        dashboardsna = normalized_sna_frame(dashboardsna, dashboardsentimen)
+
+    if CONFIG["tokens"]["enabled"]:
+        # Baris lama dari CSV (mode incremental) belum punya kolom tokens
+        for frame in (dashboardsentimen, dashboardsna):
+            if "content_text" in frame.columns:
+                missing = frame["tokens"].isna() if "tokens" in frame.columns else pd.Series(True, index=frame.index)
+                if missing.any():
+                    frame.loc[missing, "tokens"] = token_lists(frame.loc[missing, "content_text"])
+        if CONFIG["tokens"]["token_ids"]:
+            add_token_ids([dashboardsentimen, dashboardsna], paths["vocabulary"])
+
+    if get_stats().rows:
+        show_preprocessing_stats(get_stats(), sample_size=3)
+
+    if CONFIG["compact"]["enabled"]:
+        compacted = compact_dashboard_frame(dashboardsentimen)
+        memory_usage_report(dashboardsentimen, compacted, "dashboardsentimen")
+        dashboardsentimen = compacted
+        compacted = compact_dashboard_frame(dashboardsna)
+        memory_usage_report(dashboardsna, compacted, "dashboardsna")
+        dashboardsna = compacted
+        del compacted
+
+    show_data_summary(len(dashboardsentimen), len(dashboardsna), dashboardsentimen['platform'].value_counts())
+    save_outputs(dashboardsentimen, dashboardsna, paths)
+
+    # Manifest ditulis setelah output, supaya run yang gagal tidak menandai baris sebagai selesai
+    if manifest is not None:
+        for kind in manifest:
+            manifest[kind].update(new_keys[kind])
+        save_manifest(paths["manifest"], manifest, run_fingerprint)
+        log_activity(f"   🧾 {os.path.basename(paths['manifest'])} - {len(new_keys['sentimen'])} sentimen + "
+                     f"{len(new_keys['sna'])} SNA records added")
+
+    log_activity("✅ Files successfully created:")
+    log_activity("   📄 dashboardsentimen.csv - Enhanced preprocessed sentiment data")
+    log_activity("   📄 dashboardsna.csv - Enhanced preprocessed SNA data")
+    log_activity("🎉 Enhanced processing with Sastrawi complete!")
+    return dashboardsentimen, dashboardsna
 
 # ==============================
-# 9. Simpan ke CSV
+# CLI
 # ==============================
-log_activity("💾 Saving processed files...")
-
-dashboardsentimen.to_csv("/content/dashboardsentimen.csv", index=False)
-dashboardsna.to_csv("/content/dashboardsna.csv", index=False)
-
-# Save preprocessing report
-if SASTRAWI_AVAILABLE:
-    preprocessing_report = {
-        'total_records_processed': len(dashboardsentimen),
-        'sastrawi_enabled': True,
-        'stemming_applied': CONFIG['text_preprocessing']['use_sastrawi_stemming'],
-        'stopwords_combined': CONFIG['text_preprocessing']['combine_stopwords'],
-        'platform_distribution': dict(dashboardsentimen['platform'].value_counts())
-    }
-    
-    pd.DataFrame([preprocessing_report]).to_csv("/content/preprocessing_report.csv", index=False)
-    log_activity("   📊 preprocessing_report.csv - Processing statistics")
-
-log_activity("✅ Files successfully created:")
-log_activity("   📄 dashboardsentimen.csv - Enhanced preprocessed sentiment data")
-log_activity("   📄 dashboardsna.csv - Enhanced preprocessed SNA data")
-log_activity("🎉 Enhanced processing with Sastrawi complete!")
\ No newline at end of file
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Gabungkan data scraping semua platform menjadi dashboardsentimen.csv dan dashboardsna.csv"
+    )
+    parser.add_argument("--input-dir", default="/content",
+                        help="folder berisi CSV hasil scraping (default: /content)")
+    parser.add_argument("--output-dir", default=None,
+                        help="folder output dashboard (default: sama dengan --input-dir)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="folder cache stopword/stem/cleaned text (default: <output-dir>/.transform_cache)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="hanya proses baris baru sejak run terakhir")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="jumlah worker process untuk cleaning teks (>1 mengaktifkan mode paralel)")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="jumlah teks per chunk di mode paralel")
+    parser.add_argument("--platform-workers", type=int, default=None,
+                        help="jumlah proses untuk memproses platform bersamaan (>1 mengaktifkan mode paralel)")
+    parser.add_argument("--streaming", action="store_true",
+                        help="proses CSV per chunk dengan memori terbatas (untuk input besar)")
+    parser.add_argument("--stream-chunksize", type=int, default=None,
+                        help="jumlah baris per chunk di mode streaming")
+    parser.add_argument("--parquet", action="store_true",
+                        help="tulis juga dataset Parquet terpartisi (butuh pyarrow)")
+    parser.add_argument("--benchmark-read", action="store_true",
+                        help="bandingkan waktu baca output CSV vs Parquet yang sudah ada, tanpa menjalankan transform")
+    parser.add_argument("--tokens", action="store_true",
+                        help="tambahkan kolom token list di frame dashboard (dan Parquet)")
+    parser.add_argument("--token-ids", action="store_true",
+                        help="dengan --tokens: tambahkan id token dari token_vocabulary.json")
+    parser.add_argument("--compact", action="store_true",
+                        help="frame dashboard hemat memori (category, downcast, datetime64) + laporan memori")
+    parser.add_argument("--drop-original", action="store_true",
+                        help="dengan --compact: jangan simpan kolom content_original")
+    parser.add_argument("--near-duplicates", choices=["drop", "tag"], default=None,
+                        help="deteksi teks hampir sama (MinHash LSH): buang atau beri id cluster")
+    parser.add_argument("--near-duplicate-threshold", type=float, default=None,
+                        help="kemiripan Jaccard minimum untuk --near-duplicates (default 0.8)")
+    parser.add_argument("--normalized-sna", action="store_true",
+                        help="dashboardsna tanpa teks post, relasi merujuk ke dashboardsentimen lewat post_url")
+    parser.add_argument("--profile", action="store_true",
+                        help="catat waktu per langkah preprocessing dan token yang dibuang ke preprocessing_profile.json")
+    parser.add_argument("--quiet", action="store_true", help="matikan log_activity")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    output_dir = args.output_dir or args.input_dir
+
+    options = {"enable_logging": not args.quiet}
+    if args.cache_dir:
+        options["cache_dir"] = args.cache_dir
+    if args.incremental:
+        options["incremental"] = {"enabled": True}
+    if args.workers:
+        options["parallel"] = {"enabled": args.workers > 1, "workers": args.workers}
+    if args.chunk_size:
+        options.setdefault("parallel", {})["chunk_size"] = args.chunk_size
+    if args.platform_workers:
+        options["concurrent_platforms"] = {"enabled": args.platform_workers > 1, "workers": args.platform_workers}
+    if args.streaming:
+        options["streaming"] = {"enabled": True}
+    if args.stream_chunksize:
+        options.setdefault("streaming", {})["chunksize"] = args.stream_chunksize
+    if args.parquet:
+        options["parquet"] = {"enabled": True}
+    if args.tokens:
+        options["tokens"] = {"enabled": True, "token_ids": args.token_ids}
+    if args.compact:
+        options["compact"] = {"enabled": True, "keep_content_original": not args.drop_original}
+    if args.profile:
+        options["profile"] = {"enabled": True}
+    if args.normalized_sna:
+        options["normalized_sna"] = {"enabled": True}
+    if args.near_duplicates:
+        options["near_duplicates"] = {"enabled": True, "mode": args.near_duplicates}
+    if args.near_duplicate_threshold is not None:
+        options.setdefault("near_duplicates", {})["threshold"] = args.near_duplicate_threshold
+
+    paths = default_paths(args.input_dir, output_dir)
+    if args.benchmark_read:
+        apply_options(options)
+        benchmark_dashboard_reads(paths)
+        return
+
+    run_transform(paths, options)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import Transform
+
+# ==============================
+# KONFIGURASI BENCHMARK
+# ==============================
+DEFAULT_SIZES = [10_000]
+DEFAULT_REPEAT = 3
+DEFAULT_SEED = 42
+# Stage yang lebih lambat dari baseline sebanyak ini dianggap regresi
+REGRESSION_THRESHOLD = 0.10
+
+# Kosakata sintetis bergaya teks media sosial Indonesia
+ROOTS = [
+    "bangun", "jalan", "pilih", "dukung", "kerja", "politik", "rakyat", "presiden", "menteri",
+    "partai", "koalisi", "oposisi", "anggar", "hukum", "adil", "korupsi", "tangkap", "janji",
+    "kampanye", "suara", "desa", "kota", "harga", "beras", "minyak", "pajak", "gaji", "guru",
+    "sekolah", "sehat", "rumah", "sakit", "jabat", "pimpin", "bantu", "sosial", "lapor", "kritik",
+    "debat", "putus", "sidang", "dewan", "wakil", "daerah", "negara", "bangsa", "damai", "ubah"
+]
+PREFIXES = ["", "", "me", "mem", "di", "ber", "ter", "pe", "ke"]
+SUFFIXES = ["", "", "", "kan", "an", "nya", "i", "lah"]
+FILLERS = [
+    "yang", "dan", "di", "ke", "dari", "untuk", "ini", "itu", "tidak", "sudah", "akan", "juga",
+    "wkwk", "bgt", "gak", "nih", "sih", "dong", "ya", "banget", "aja", "kok"
+]
+EXTRAS = ["@warga{}", "#pemilu{}", "https://t.co/{}", "{}", "!!!", "??", "..."]
+COUNT_FORMATS = ["{}", "{}", "{}.{}K", "{},{}JT", "{}RB", "{}M", ""]
+DATE_FORMATS = ["iso_z", "iso_offset", "epoch", "naive"]
+
+# Stopword Sastrawi pengganti (subset kecil, deterministik)
+STAND_IN_STOPWORDS = {"yang", "dan", "di", "ke", "dari", "untuk", "ini", "itu", "tidak", "sudah", "akan", "juga"}
+
+# ==============================
+# SASTRAWI STAND-IN
+# ==============================
+class StandInStemmer:
+    """Deterministic affix stripper used when Sastrawi is not installed.
+
+    It is not linguistically correct, but like Sastrawi it stems each word
+    independently and does a similar amount of string work per word.
+    """
+
+    PREFIXES = ("mem", "men", "meng", "me", "di", "ber", "ter", "pe", "ke")
+    SUFFIXES = ("kan", "nya", "lah", "an", "i")
+
+    def stem(self, text):
+        words = []
+        for word in text.split():
+            for prefix in self.PREFIXES:
+                if word.startswith(prefix) and len(word) > len(prefix) + 3:
+                    word = word[len(prefix):]
+                    break
+            for suffix in self.SUFFIXES:
+                if word.endswith(suffix) and len(word) > len(suffix) + 3:
+                    word = word[:-len(suffix)]
+                    break
+            words.append(word)
+        return " ".join(words)
+
+def setup_stemmer(use_stand_in):
+    """Use the real Sastrawi when installed, otherwise the stand-in; returns the stemmer name"""
+    if not use_stand_in and Transform.init_sastrawi():
+        return "sastrawi"
+
+    Transform.stemmer = StandInStemmer()
+    Transform.sastrawi_stopwords = set(STAND_IN_STOPWORDS)
+    Transform.SASTRAWI_AVAILABLE = True
+    Transform._SASTRAWI_INITIALIZED = True
+    return "stand-in"
+
+def reset_stemmer(stemmer_name):
+    """Drop Transform's stemmer and Sastrawi state and set the same stemmer up again"""
+    Transform.stemmer = None
+    Transform._SASTRAWI_INITIALIZED = False
+    Transform.SASTRAWI_AVAILABLE = importlib.util.find_spec("Sastrawi") is not None
+    setup_stemmer(stemmer_name == "stand-in")
+
+def setup_offline_config(cache_dir):
+    """Point Transform at a fresh cache dir seeded with stopwords, so nothing touches the network"""
+    Transform.apply_options({
+        "cache_dir": cache_dir,
+        "enable_logging": False,
+        "cleaned_text_cache": False,
+        "parallel": {"enabled": False},
+        "concurrent_platforms": {"enabled": False}
+    })
+    Transform._STEM_CACHE = None
+    Transform._CLEAN_TEXT_CACHE = None
+    Transform._STOPWORD_REGISTRY.clear()
+    Transform._TEXT_CLEANERS.clear()
+    Transform._save_stopword_cache(Transform.get_cache_path("stopwords.json"), Transform.DEFAULT_STOPWORDS)
+
+# ==============================
+# DATA SINTETIS
+# ==============================
+def synthetic_words(rng, count):
+    """Random affixed words, e.g. 'dibangunkan', 'pemilihnya'"""
+    roots = rng.choice(ROOTS, count)
+    prefixes = rng.choice(PREFIXES, count)
+    suffixes = rng.choice(SUFFIXES, count)
+    return np.char.add(np.char.add(prefixes, roots), suffixes)
+
+def synthetic_texts(rng, rows, duplicate_rate=0.2):
+    """Indonesian-style social posts with mentions, hashtags, URLs, slang and retweet-like duplicates"""
+    lengths = rng.integers(5, 30, rows)
+    total = int(lengths.sum())
+
+    words = synthetic_words(rng, total).astype(object)
+    is_filler = rng.random(total) < 0.3
+    words[is_filler] = rng.choice(FILLERS, int(is_filler.sum()))
+    is_extra = rng.random(total) < 0.08
+    extras = rng.choice(EXTRAS, int(is_extra.sum()))
+    numbers = rng.integers(1, 9999, int(is_extra.sum()))
+    words[is_extra] = [template.format(n) for template, n in zip(extras, numbers)]
+
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    texts = [" ".join(words[bounds[i]:bounds[i + 1]]) for i in range(rows)]
+
+    # Retweet / repost: teks yang sama muncul lagi di baris lain
+    duplicates = np.flatnonzero(rng.random(rows) < duplicate_rate)
+    sources = rng.integers(0, rows, len(duplicates))
+    for target, source in zip(duplicates, sources):
+        texts[target] = texts[source]
+    return texts
+
+def synthetic_counts(rng, rows):
+    """Engagement counts as scraped: plain ints, 1.2K, 3,4JT, 15RB, empty cells"""
+    formats = rng.choice(COUNT_FORMATS, rows)
+    whole = rng.integers(0, 999, rows)
+    fraction = rng.integers(0, 9, rows)
+    return [fmt.format(w, f) for fmt, w, f in zip(formats, whole, fraction)]
+
+def synthetic_datetimes(rng, rows, kind):
+    """Timestamps in one source format: ISO with Z, ISO with offset, epoch seconds or naive"""
+    seconds = rng.integers(1_600_000_000, 1_760_000_000, rows)
+    stamps = pd.to_datetime(seconds, unit="s", utc=True)
+    if kind == "epoch":
+        return pd.Series(seconds)
+    if kind == "iso_z":
+        return pd.Series(stamps.strftime("%Y-%m-%dT%H:%M:%S.000Z"))
+    if kind == "iso_offset":
+        return pd.Series(stamps.tz_convert("Asia/Jakarta").strftime("%Y-%m-%dT%H:%M:%S%z"))
+    return pd.Series(stamps.strftime("%Y-%m-%d %H:%M:%S"))
+
+def synthetic_platform(rng, rows):
+    """Raw Twitter-shaped posts plus SNA relations referencing them"""
+    urls = [f"https://x.com/user/status/{i}" for i in range(rows)]
+    posts = pd.DataFrame({
+        "display_name": rng.choice([f"User {i}" for i in range(500)], rows),
+        "username": rng.choice([f"@user{i}" for i in range(500)], rows),
+        "tweet_text": synthetic_texts(rng, rows),
+        "tweet_url": urls,
+        "timestamp": synthetic_datetimes(rng, rows, "iso_offset"),
+        "likes": synthetic_counts(rng, rows),
+        "retweets": synthetic_counts(rng, rows),
+        "replies": synthetic_counts(rng, rows),
+        "views": synthetic_counts(rng, rows),
+        "hashtags": "[]",
+        "mentions": "[]",
+        "scraped_at": synthetic_datetimes(rng, rows, "naive")
+    })
+
+    relation_rows = max(1, rows // 2)
+    relations = pd.DataFrame({
+        "source": rng.choice([f"@user{i}" for i in range(500)], relation_rows),
+        "target": rng.choice([f"@user{i}" for i in range(500)], relation_rows),
+        "relation": rng.choice(["mention", "retweet", "reply", "hashtag"], relation_rows),
+        "tweet_url": rng.choice(urls, relation_rows),
+        "timestamp": synthetic_datetimes(rng, relation_rows, "iso_z"),
+        "scraped_at": synthetic_datetimes(rng, relation_rows, "naive")
+    })
+    return posts, relations
+
+# ==============================
+# STAGES
+# ==============================
+def time_stage(func, repeat, setup=None):
+    """Best wall time of `repeat` runs; setup() runs untimed before each one"""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def benchmark_size(rows, repeat, seed, cache_root, stemmer_name):
+    """Time every Transform stage on `rows` synthetic rows"""
+    rng = np.random.default_rng(seed)
+    posts, relations = synthetic_platform(rng, rows)
+    texts = posts["tweet_text"]
+    epochs = synthetic_datetimes(rng, rows, "epoch")
+    sentimen = Transform.sentimen_frame("twitter", posts)
+
+    def cold():
+        # Setiap ulangan mulai dari stemmer baru, memo TextCleaner dan cache stem/stopword yang kosong
+        setup_offline_config(tempfile.mkdtemp(dir=cache_root))
+        reset_stemmer(stemmer_name)
+
+    cold_stages = {"clean_text_advanced", "clean_text_column", "preprocess_dataframe"}
+    stages = {
+        "clean_text_advanced": lambda: [Transform.clean_text_advanced(t) for t in texts],
+        "clean_text_column": lambda: Transform.clean_text_column(texts),
+        "preprocess_dataframe": lambda: Transform.preprocess_dataframe(sentimen.copy()),
+        "engagement_counts": lambda: Transform.parse_engagement_counts(posts["likes"]),
+        "datetimes_iso_offset": lambda: Transform.normalize_datetime_column(posts["timestamp"]),
+        "datetimes_naive": lambda: Transform.normalize_datetime_column(posts["scraped_at"]),
+        "datetimes_epoch": lambda: Transform.normalize_datetime_column(epochs),
+        "sna_merge": lambda: Transform.sna_frame("twitter", posts, relations),
+        "combine_platforms": lambda: Transform.combine_platforms(
+            [sentimen, sentimen, sentimen, sentimen],
+            [Transform.sna_frame("twitter", posts, relations)[0]] * 4
+        ),
+        "near_duplicates": lambda: Transform.near_duplicate_clusters(texts)
+    }
+
+    results = {}
+    for name, func in stages.items():
+        seconds = time_stage(func, repeat, setup=cold if name in cold_stages else None)
+        results[name] = {"seconds": round(seconds, 6), "rows_per_second": round(rows / seconds, 1)}
+        print(f"   {name:<22} {seconds * 1000:10.1f} ms  {rows / seconds:14,.0f} rows/s")
+    return results
+
+def benchmark_corpus(path, repeat, thresholds=(0.7, 0.8, 0.9)):
+    """Near-duplicate clustering on an existing dashboard CSV (its content_text column)"""
+    texts = pd.read_csv(path, usecols=["content_text"])["content_text"].fillna("").astype(str).tolist()
+    print(f"🧬 Near-duplicates on {path} ({len(texts):,} texts, best of {repeat})")
+    results = {}
+    for threshold in thresholds:
+        representative = []
+        seconds = time_stage(
+            lambda: representative.append(Transform.near_duplicate_clusters(texts, threshold=threshold)), repeat
+        )
+        representative = representative[-1]
+        duplicates = int((representative != np.arange(len(texts))).sum())
+        clusters = int(len(np.unique(representative[representative != np.arange(len(texts))])))
+        results[str(threshold)] = {
+            "seconds": round(seconds, 6),
+            "rows_per_second": round(len(texts) / seconds, 1),
+            "duplicates": duplicates,
+            "clusters": clusters
+        }
+        print(f"   threshold {threshold:.2f} {seconds * 1000:10.1f} ms  {duplicates:6} near-duplicates "
+              f"in {clusters} clusters")
+    return results
+
+# ==============================
+# BASELINE
+# ==============================
+def compare_with_baseline(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Print per-stage ratios against a stored run; returns the regressed (size, stage) pairs"""
+    regressions = []
+    print(f"\n📐 Compared with baseline from {baseline['meta'].get('created_at', '?')}:")
+    for size, stages in results["sizes"].items():
+        base_stages = baseline["sizes"].get(size)
+        if not base_stages:
+            print(f"   {size} rows: no baseline")
+            continue
+        for name, current in stages.items():
+            base = base_stages.get(name)
+            if not base:
+                continue
+            ratio = current["seconds"] / base["seconds"]
+            flag = "⚠️ slower" if ratio > 1 + threshold else "✅" if ratio < 1 - threshold else ""
+            print(f"   {size:>8} {name:<22} {base['seconds'] * 1000:10.1f} → {current['seconds'] * 1000:10.1f} ms "
+                  f"(x{ratio:.2f}) {flag}")
+            if ratio > 1 + threshold:
+                regressions.append((size, name))
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark tahapan preprocessing Transform pada data sintetis")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="jumlah baris per run, mis. --sizes 10000 100000 1000000")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="ambil waktu terbaik dari N ulangan")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--stand-in", action="store_true",
+                        help="pakai stemmer pengganti meskipun Sastrawi terpasang (hasil lebih stabil antar mesin)")
+    parser.add_argument("--output", default="benchmark_results.json", help="file JSON hasil benchmark")
+    parser.add_argument("--corpus", default=None,
+                        help="CSV dashboard yang sudah ada (mis. dashboardsentimen.csv) untuk benchmark near-duplicate")
+    parser.add_argument("--baseline", default=None, help="file JSON hasil run sebelumnya untuk dibandingkan")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help=f"exit code 1 jika ada stage > {REGRESSION_THRESHOLD * 100:.0f}%% lebih lambat dari baseline")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    cache_root = tempfile.mkdtemp(prefix="transform_bench_")
+    setup_offline_config(tempfile.mkdtemp(dir=cache_root))
+    stemmer_name = setup_stemmer(args.stand_in)
+
+    results = {
+        "meta": {
+            "created_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "stemmer": stemmer_name,
+            "repeat": args.repeat,
+            "seed": args.seed
+        },
+        "sizes": {}
+    }
+
+    try:
+        for rows in args.sizes:
+            print(f"⏱️ {rows:,} rows ({stemmer_name} stemmer, best of {args.repeat})")
+            results["sizes"][str(rows)] = benchmark_size(rows, args.repeat, args.seed, cache_root, stemmer_name)
+    finally:
+        shutil.rmtree(cache_root, ignore_errors=True)
+
+    if args.corpus:
+        results["corpus"] = {"path": args.corpus, **benchmark_corpus(args.corpus, args.repeat)}
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"💾 Results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
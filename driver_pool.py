@@ -0,0 +1,206 @@
+"""
+Pool WebDriver yang tetap hidup di antara run scheduler (tiktok.py, twiter.py).
+
+Setiap run sebelumnya menjalankan ChromeDriverManager().install(), meluncurkan
+Chrome baru, menyuntikkan script anti-detection lalu quit(). DriverPool menyimpan
+browser yang sudah "hangat" untuk dipakai ulang, memeriksa kesehatannya sebelum
+dipinjamkan, dan mendaur ulang browser setelah N pemakaian atau saat memorinya
+melewati batas.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:  # Opsional: tanpa psutil memori diukur dari JS heap
+    psutil = None
+
+# ------------------------------
+# Chromedriver path cache
+# ------------------------------
+_CHROMEDRIVER_PATH = None
+
+def chromedriver_path():
+    """
+    Path chromedriver, di-resolve sekali per proses.
+
+    CHROMEDRIVER_PATH di environment dipakai langsung jika file-nya ada,
+    sehingga ChromeDriverManager (dan network check-nya) dilewati sepenuhnya.
+    """
+    global _CHROMEDRIVER_PATH
+    if _CHROMEDRIVER_PATH and os.path.exists(_CHROMEDRIVER_PATH):
+        return _CHROMEDRIVER_PATH
+
+    env_path = os.environ.get("CHROMEDRIVER_PATH")
+    if env_path and os.path.exists(env_path):
+        _CHROMEDRIVER_PATH = env_path
+    else:
+        from webdriver_manager.chrome import ChromeDriverManager
+        _CHROMEDRIVER_PATH = ChromeDriverManager().install()
+    return _CHROMEDRIVER_PATH
+
+# ------------------------------
+# Health & memory
+# ------------------------------
+def driver_is_healthy(driver):
+    """True jika session browser masih merespons"""
+    try:
+        return bool(driver.window_handles) and driver.execute_script("return 1;") == 1
+    except Exception:
+        return False
+
+def driver_memory_mb(driver):
+    """Perkiraan memori browser (MB): RSS proses Chrome dengan psutil, JS heap tanpa psutil"""
+    try:
+        if psutil is not None:
+            service_process = psutil.Process(driver.service.process.pid)
+            processes = [service_process] + service_process.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        heap = driver.execute_script(
+            "return performance.memory ? performance.memory.usedJSHeapSize : 0;")
+        return (heap or 0) / (1024 * 1024)
+    except Exception:
+        return 0.0
+
+def reset_driver(driver):
+    """Tutup tab tambahan dan kosongkan halaman; cookies (mis. login) tetap disimpan"""
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    driver.get("about:blank")
+    # Buang event performance log sisa run ini (termasuk about:blank) agar tidak masuk NetworkStats run berikutnya
+    try:
+        driver.get_log("performance")
+    except Exception:
+        pass  # Performance log tidak diaktifkan
+
+# ------------------------------
+# Driver pool
+# ------------------------------
+class DriverPool:
+    """Pool browser hangat; factory() membuat driver baru yang sudah siap pakai"""
+
+    def __init__(self, factory, size=1, max_uses=20, max_memory_mb=1500, name="driver"):
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.name = name
+        self.idle = []
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def _create(self):
+        started = time.perf_counter()
+        driver = self.factory()
+        self.entries[id(driver)] = {"driver": driver, "uses": 0, "meta": {}}
+        print(f"[{self.name} pool] Browser baru siap dalam {time.perf_counter() - started:.1f}s")
+        return driver
+
+    def _discard(self, driver, reason):
+        self.entries.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        print(f"[{self.name} pool] Browser didaur ulang ({reason})")
+
+    def warm(self):
+        """Isi pool sampai `size` browser idle"""
+        with self.lock:
+            while len(self.entries) < self.size:
+                self.idle.append(self._create())
+
+    def acquire(self):
+        """Pinjam browser sehat dari pool, buat baru jika tidak ada"""
+        started = time.perf_counter()
+        with self.lock:
+            while self.idle:
+                driver = self.idle.pop()
+                if driver_is_healthy(driver):
+                    self.entries[id(driver)]["uses"] += 1
+                    print(f"[{self.name} pool] Browser dipakai ulang "
+                          f"(ke-{self.entries[id(driver)]['uses']}, {time.perf_counter() - started:.2f}s)")
+                    return driver
+                self._discard(driver, "health check gagal")
+
+            driver = self._create()
+            self.entries[id(driver)]["uses"] += 1
+            return driver
+
+    def release(self, driver, healthy=True):
+        """
+        Kembalikan browser ke pool.
+
+        Browser di-quit jika tidak sehat, sudah dipakai max_uses kali, atau
+        memorinya melewati max_memory_mb; penggantinya langsung dibuat agar
+        run berikutnya tetap mendapat browser hangat.
+        """
+        with self.lock:
+            entry = self.entries.get(id(driver))
+            if entry is None:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+                return
+
+            reason = None
+            if not healthy or not driver_is_healthy(driver):
+                reason = "tidak sehat"
+            elif self.max_uses and entry["uses"] >= self.max_uses:
+                reason = f"{entry['uses']} pemakaian"
+            else:
+                memory = driver_memory_mb(driver)
+                if self.max_memory_mb and memory > self.max_memory_mb:
+                    reason = f"memori {memory:.0f} MB"
+
+            if reason is None:
+                try:
+                    reset_driver(driver)
+                except Exception:
+                    reason = "reset gagal"
+
+            if reason is None:
+                self.idle.append(driver)
+                return
+
+            self._discard(driver, reason)
+            try:
+                if len(self.entries) < self.size:
+                    self.idle.append(self._create())
+            except Exception as e:
+                print(f"[{self.name} pool] Gagal membuat browser pengganti: {e}")
+
+    def meta(self, driver):
+        """State per browser yang ikut dipakai ulang (mis. status login)"""
+        entry = self.entries.get(id(driver))
+        return entry["meta"] if entry else {}
+
+    @contextmanager
+    def driver(self):
+        """with pool.driver() as driver: ... (browser ditandai tidak sehat jika terjadi exception)"""
+        driver = self.acquire()
+        healthy = True
+        try:
+            yield driver
+        except Exception:
+            healthy = False
+            raise
+        finally:
+            self.release(driver, healthy=healthy)
+
+    def close_all(self):
+        """Quit semua browser di pool"""
+        with self.lock:
+            for entry in list(self.entries.values()):
+                try:
+                    entry["driver"].quit()
+                except Exception:
+                    pass
+            self.entries.clear()
+            self.idle.clear()
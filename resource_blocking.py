@@ -0,0 +1,183 @@
+"""
+Profil blocking resource jaringan untuk browser scraper (tiktok.py, twiter.py).
+
+Thumbnail, preview video, font dan script tracking mendominasi bandwidth dan
+waktu settle halaman saat scroll, padahal tidak ada yang dipakai untuk ekstraksi.
+Profil diterapkan lewat CDP Network.setBlockedURLs (pola URL, per tab; tab baru
+dibuka dengan open_blocked_tab) dan, untuk tipe resource gambar, lewat content
+setting Chrome. NetworkStats mencatat bytes yang ditransfer (dari performance
+log chromedriver) dan waktu load halaman per run agar profil bisa dibandingkan.
+"""
+import csv
+import json
+import os
+from datetime import datetime, timezone
+
+# ------------------------------
+# Profil blocking
+# ------------------------------
+FONT_PATTERNS = ["*.woff*", "*.ttf*", "*.otf*", "*fonts.googleapis.com*", "*fonts.gstatic.com*"]
+
+MEDIA_PATTERNS = [
+    "*.mp4*", "*.webm*", "*.m3u8*", "*.m4s*", "*.m4a*", "*.mp3*",
+    "*mime_type=video*",  # URL video TikTok tanpa ekstensi
+    "*video.twimg.com*",
+]
+
+TRACKER_PATTERNS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*analytics.tiktok.com*", "*analytics.twitter.com*", "*ads-twitter.com*",
+    "*/1.1/jot/*",  # client event logging Twitter
+]
+
+IMAGE_PATTERNS = [
+    "*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*",
+    "*~tplv-*",  # thumbnail TikTok
+    "*pbs.twimg.com/media*", "*pbs.twimg.com/profile_images*",
+]
+
+# "light" aman untuk data yang diekstrak: teks, link, username, waktu dan
+# counter engagement tetap ada. "aggressive" juga memblokir gambar; atribut
+# alt tetap ada di DOM, tetapi halaman dengan lazy-render bisa menampilkan
+# lebih sedikit card per scroll.
+BLOCKING_PROFILES = {
+    "off": {"patterns": [], "block_images": False},
+    "light": {"patterns": FONT_PATTERNS + MEDIA_PATTERNS + TRACKER_PATTERNS, "block_images": False},
+    "aggressive": {"patterns": FONT_PATTERNS + MEDIA_PATTERNS + TRACKER_PATTERNS + IMAGE_PATTERNS,
+                   "block_images": True},
+}
+
+DEFAULT_PROFILE = "light"
+
+def get_blocking_profile(name):
+    """Profil berdasarkan nama; nama tidak dikenal memakai DEFAULT_PROFILE"""
+    if name not in BLOCKING_PROFILES:
+        print(f"Warning: profil blocking '{name}' tidak dikenal, memakai '{DEFAULT_PROFILE}'")
+        name = DEFAULT_PROFILE
+    return BLOCKING_PROFILES[name]
+
+def blocking_prefs(name):
+    """Chrome prefs untuk blocking per tipe resource (diterapkan saat browser dibuat)"""
+    if get_blocking_profile(name)["block_images"]:
+        return {"profile.managed_default_content_settings.images": 2}
+    return {}
+
+def apply_blocking_profile(driver, name):
+    """Terapkan pola URL profil lewat CDP pada tab aktif"""
+    profile = get_blocking_profile(name)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": profile["patterns"]})
+    except Exception as e:
+        print(f"Warning: gagal menerapkan profil blocking '{name}': {e}")
+
+def open_blocked_tab(driver, name):
+    """
+    Buka tab kosong, pindah ke tab itu dan terapkan profil blocking di sana.
+
+    Perintah CDP hanya berlaku untuk target (tab) yang aktif saat dipanggil,
+    jadi setiap tab baru perlu profilnya sendiri. Return handle tab baru.
+    """
+    before = set(driver.window_handles)
+    driver.execute_script("window.open('');")
+    handle = next((h for h in driver.window_handles if h not in before), driver.window_handles[-1])
+    driver.switch_to.window(handle)
+    apply_blocking_profile(driver, name)
+    return handle
+
+# ------------------------------
+# Statistik jaringan per run
+# ------------------------------
+# Bytes dihitung dari encodedDataLength event Network.loadingFinished di
+# performance log chromedriver (semua tab, termasuk response cross-origin).
+# Resource Timing tidak dipakai: transferSize-nya 0 untuk response cross-origin
+# tanpa Timing-Allow-Origin, yaitu hampir semua CDN TikTok dan Twitter.
+def enable_network_log(options):
+    """Aktifkan performance log (event Network saja) di ChromeOptions untuk NetworkStats"""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+# Waktu load dokumen aktif, sekali per halaman
+LOAD_TIME_JS = """
+if (!location.protocol.startsWith('http') || window.__networkStatsSeen) return null;
+const nav = performance.getEntriesByType('navigation')[0];
+window.__networkStatsSeen = true;
+return nav ? (nav.loadEventEnd || nav.domContentLoadedEventEnd || null) : null;
+"""
+
+class NetworkStats:
+    """Akumulasi bytes, jumlah request, request yang diblokir dan waktu load halaman selama satu run"""
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.bytes = 0
+        self.requests = 0
+        self.blocked = 0
+        self.load_times = []
+        self.network_log = True
+
+    def collect(self, driver):
+        """
+        Tambahkan event jaringan sejak pengambilan terakhir dan waktu load halaman aktif.
+
+        Panggil sebelum navigasi ke halaman lain dan di akhir run; get_log
+        mengosongkan buffer log sehingga event tidak terhitung dua kali.
+        """
+        try:
+            entries = driver.get_log("performance")
+        except Exception:
+            if self.network_log:
+                print("Warning: performance log tidak tersedia, bytes jaringan tidak dicatat")
+            self.network_log = False
+            entries = []
+
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            params = message.get("params", {})
+            if message.get("method") == "Network.loadingFinished":
+                self.bytes += params.get("encodedDataLength") or 0
+                self.requests += 1
+            elif message.get("method") == "Network.loadingFailed" and params.get("blockedReason"):
+                self.blocked += 1
+
+        try:
+            load_ms = driver.execute_script(LOAD_TIME_JS)
+        except Exception:
+            load_ms = None
+        if load_ms:
+            self.load_times.append(load_ms)
+
+    def to_dict(self):
+        return {
+            "profile": self.profile,
+            "bytes": int(self.bytes) if self.network_log else None,
+            "requests": self.requests,
+            "blocked": self.blocked,
+            "pages": len(self.load_times),
+            "avg_load_ms": round(sum(self.load_times) / len(self.load_times), 1) if self.load_times else None,
+        }
+
+    def summary(self):
+        stats = self.to_dict()
+        load = f"{stats['avg_load_ms'] / 1000:.2f}s" if stats["avg_load_ms"] is not None else "-"
+        size = f"{stats['bytes'] / (1024 * 1024):.1f} MB" if stats["bytes"] is not None else "bytes tidak tercatat"
+        return (f"Network (profil {self.profile}): {size}, {stats['requests']} request, "
+                f"{stats['blocked']} diblokir, {stats['pages']} halaman, load rata-rata {load}")
+
+def save_network_stats(stats, filename, **extra):
+    """Tambahkan satu baris statistik run ke CSV (mis. keyword dan jumlah data)"""
+    if not filename:
+        return
+    row = {"run_at": datetime.now(timezone.utc).isoformat(), **stats.to_dict(), **extra}
+    try:
+        write_header = not os.path.exists(filename)
+        with open(filename, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(row))
+            if write_header:
+                writer.writeheader()
+            writer.writerow(row)
+    except Exception as e:
+        print(f"Warning: gagal menyimpan statistik network: {e}")
@@ -0,0 +1,47 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Transform import parse_engagement_counts
+
+
+def parse(values):
+    result, _ = parse_engagement_counts(pd.Series(values, dtype=object))
+    return result.tolist()
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1.2K", 1200),
+    ("4.35K", 4350),
+    ("3,4JT", 3_400_000),
+    ("15rb", 15_000),
+    ("2M", 2_000_000),
+    ("1B", 1_000_000_000),
+    (" 7 K ", 7000),
+    ("1.234", 1234),
+    ("1,234,567", 1_234_567),
+    ("12.0", 12),
+    ("10", 10),
+    ("", 0),
+    ("N/A", 0),
+    (None, 0),
+])
+def test_parses_counts(value, expected):
+    assert parse([value]) == [expected]
+
+
+@pytest.mark.parametrize("value", ["1.2.3K", "1,23", "1.5", "abc", "1.2345K", "99999999999999999999"])
+def test_malformed_counts_are_na(value):
+    result, unparseable = parse_engagement_counts(pd.Series([value, "1K"], dtype=object))
+    assert result.isna().tolist() == [True, False]
+    assert unparseable == 1
+
+
+def test_numeric_and_mixed_columns():
+    assert parse([5, 2.7, "2K"]) == [5, 2, 2000]
+    result, _ = parse_engagement_counts(pd.Series([1, 2, 3]))
+    assert result.tolist() == [1, 2, 3]
@@ -4,14 +4,19 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_pool import DriverPool, chromedriver_path
+from resource_blocking import (NetworkStats, apply_blocking_profile, blocking_prefs, enable_network_log,
+                               open_blocked_tab, save_network_stats)
 import pandas as pd
+import atexit
 import time
 import random
 import re
 import os
+import sys
 import schedule
 from datetime import datetime, timezone, timedelta
+from urllib.parse import urlparse
 from dateutil import parser
 import warnings
 import logging
@@ -45,7 +50,20 @@ CONFIG = {
     "sna_filename": "tiktok_sna_relations.csv",
     "interval_minutes": 15,
     "headless": True,
-    "fetch_likes_from_video_page": False
+    "fetch_likes_from_video_page": False,
+    "enrich_concurrency": 4,  # Tab paralel untuk fetch engagement (0 = satu per satu)
+    "enrich_per_domain": 2,  # Maksimal request bersamaan per domain (semua link di tiktok.com, jadi < enrich_concurrency)
+    "enrich_min_interval": 0.5,  # Jeda minimum (detik) antar request ke domain yang sama
+    "batch_extract": True,  # Ekstraksi semua card dalam satu execute_script
+    "incremental_extract": False,  # Ekstrak card baru setelah setiap scroll
+    "detach_extracted_cards": False,  # Sembunyikan card yang sudah diekstrak (mode incremental)
+    "reuse_driver": True,  # Simpan browser hangat di antara run scheduler
+    "driver_pool_size": 1,
+    "driver_max_uses": 20,  # Daur ulang browser setelah N run
+    "driver_max_memory_mb": 1500,  # ... atau jika memorinya melewati batas ini
+    "blocking_profile": "light",  # off / light / aggressive (lihat resource_blocking.py)
+    "network_stats": False,  # Aktifkan performance log chromedriver untuk statistik network per run
+    "network_stats_filename": "tiktok_network_stats.csv"
 }
 
 # ------------------------------
@@ -53,6 +71,20 @@ CONFIG = {
 # ------------------------------
 MENTION_RE = re.compile(r'@([A-Za-z0-9_.]+)')
 
+CONTAINER_XPATHS = [
+    '//div[contains(@class, "DivItemContainerForSearch")]',
+    '//div[contains(@class, "DivItemContainer")]',
+    '//div[contains(@class, "video-feed-item")]',
+]
+
+LIKE_SELECTORS = [
+    './/strong[@data-e2e="like-count"]',
+    './/span[@data-e2e="like-count"]',
+    './/strong[contains(@class, "count")]',
+    './/span[contains(@data-e2e, "like")]',
+    './/button[contains(@data-e2e, "like")]//span',
+]
+
 def normalize_timestamp(timestamp_str):
     """FIXED: Normalisasi timestamp ke format ISO 8601 yang konsisten"""
     if not timestamp_str or timestamp_str.strip() == "":
@@ -184,9 +216,16 @@ def setup_driver(headless=True):
     ]
     options.add_argument(f"--user-agent={random.choice(user_agents)}")
 
-    service = Service(ChromeDriverManager().install())
+    prefs = blocking_prefs(CONFIG["blocking_profile"])
+    if prefs:
+        options.add_experimental_option("prefs", prefs)
+    if CONFIG["network_stats"]:
+        enable_network_log(options)
+
+    service = Service(chromedriver_path())
     service.creation_flags = 0x08000000  # CREATE_NO_WINDOW flag untuk Windows
     driver = webdriver.Chrome(service=service, options=options)
+    apply_blocking_profile(driver, CONFIG["blocking_profile"])
 
     try:
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
@@ -202,6 +241,41 @@ def setup_driver(headless=True):
 
     return driver
 
+def find_video_containers(driver):
+    """Cari container video pada halaman search (fallback antar layout)"""
+    for xpath in CONTAINER_XPATHS:
+        containers = driver.find_elements(By.XPATH, xpath)
+        if containers:
+            return containers
+    return []
+
+def fetch_likes_from_page(driver, link):
+    """Buka video di tab baru dan ambil jumlah likes, None jika gagal"""
+    likes = None
+    try:
+        original_handle = driver.current_window_handle
+        open_blocked_tab(driver, CONFIG["blocking_profile"])
+        driver.get(link)
+        time.sleep(random.uniform(2.0, 4.0))
+        try:
+            like_el = WebDriverWait(driver, 3).until(
+                EC.presence_of_element_located((By.XPATH,
+                    '//strong[@data-e2e="like-count"] | //button[@data-e2e="like-icon"]//strong | //button[@aria-label and contains(translate(@aria-label, "LIKE", "like"), "like")]//span'))
+            )
+            likes = like_el.text.strip() or None
+        except:
+            pass
+        driver.close()
+        driver.switch_to.window(original_handle)
+    except Exception:
+        try:
+            if len(driver.window_handles) > 1:
+                driver.close()
+                driver.switch_to.window(driver.window_handles[0])
+        except:
+            pass
+    return likes
+
 # ------------------------------
 # Extract individual container data
 # ------------------------------
@@ -289,14 +363,7 @@ def extract_video_data(container_element, driver=None, fetch_likes_from_video_pa
         engagement_found = False
         
         # Coba ekstrak likes
-        like_selectors = [
-            './/strong[@data-e2e="like-count"]',
-            './/span[@data-e2e="like-count"]',
-            './/strong[contains(@class, "count")]',
-            './/span[contains(@data-e2e, "like")]',
-            './/button[contains(@data-e2e, "like")]//span',
-        ]
-        for sel in like_selectors:
+        for sel in LIKE_SELECTORS:
             try:
                 el = container_element.find_element(By.XPATH, sel)
                 txt = el.text.strip()
@@ -322,29 +389,7 @@ def extract_video_data(container_element, driver=None, fetch_likes_from_video_pa
 
         # Jika belum ada engagement dan diminta untuk fetch dari video page
         if not engagement_found and fetch_likes_from_video_page and driver and data["link"]:
-            try:
-                original_handle = driver.current_window_handle
-                driver.execute_script("window.open('');")
-                driver.switch_to.window(driver.window_handles[-1])
-                driver.get(data["link"])
-                time.sleep(random.uniform(2.0, 4.0))
-                try:
-                    like_el = WebDriverWait(driver, 3).until(
-                        EC.presence_of_element_located((By.XPATH,
-                            '//strong[@data-e2e="like-count"] | //button[@data-e2e="like-icon"]//strong | //button[@aria-label and contains(translate(@aria-label, "LIKE", "like"), "like")]//span'))
-                    )
-                    data["likes"] = like_el.text.strip() or data["likes"]
-                except:
-                    pass
-                driver.close()
-                driver.switch_to.window(original_handle)
-            except Exception:
-                try:
-                    if len(driver.window_handles) > 1:
-                        driver.close()
-                        driver.switch_to.window(driver.window_handles[0])
-                except:
-                    pass
+            data["likes"] = fetch_likes_from_page(driver, data["link"]) or data["likes"]
 
         # Set default values jika masih kosong
         for metric in ["likes", "shares", "comments"]:
@@ -360,6 +405,408 @@ def extract_video_data(container_element, driver=None, fetch_likes_from_video_pa
         print("Error ekstraksi container:", e)
         return None
 
+# ------------------------------
+# Batch extraction (satu round-trip untuk semua card)
+# ------------------------------
+# Logika fallback sama dengan extract_video_data, dijalankan di browser.
+# Mengembalikan record mentah; normalisasi dilakukan di video_data_from_record.
+# Dengan skipScraped=true card yang sudah ditandai MARK_CARDS_JS dilewati.
+EXTRACT_CARDS_JS = """
+const containerXpaths = arguments[0], likeSelectors = arguments[1];
+const start = arguments[2] || 0, limit = arguments[3];
+const skipScraped = arguments[4];
+
+function all(xpath, ctx) {
+    const snap = document.evaluate(xpath, ctx, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const nodes = [];
+    for (let i = 0; i < snap.snapshotLength; i++) nodes.push(snap.snapshotItem(i));
+    return nodes;
+}
+function first(xpath, ctx) {
+    return document.evaluate(xpath, ctx, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+function text(el) {
+    return ((el && el.innerText) || '').trim();
+}
+
+let cards = [];
+for (const xpath of containerXpaths) {
+    cards = all(xpath, document);
+    if (cards.length) break;
+}
+if (skipScraped) cards = cards.filter(card => !card.hasAttribute('data-scraped'));
+const end = limit == null ? cards.length : Math.min(cards.length, start + limit);
+
+const records = [];
+for (let i = start; i < end; i++) {
+    const card = cards[i];
+    const link = first('.//a[contains(@href, "/video/")]', card);
+    if (!link) { records.push(null); continue; }
+    const rec = {link: link.href, title: '', description: '', username: null, user_href: '',
+                 time_text: '', likes: '0', shares: '0', comments: '0', engagement_found: false};
+
+    let el = first('.//span[@data-e2e="new-desc-span"]', card)
+          || first('.//div[@data-e2e="search-card-video-caption"]//span', card);
+    if (el) {
+        rec.title = text(el);
+    } else {
+        el = first('.//img[@alt]', card);
+        const alt = el ? (el.getAttribute('alt') || '').trim() : '';
+        if (alt) { rec.title = alt.slice(0, 200); rec.description = alt; }
+    }
+
+    el = first('.//p[@data-e2e="search-card-user-unique-id"]', card);
+    if (el) {
+        rec.username = text(el);
+    } else {
+        el = first('.//a[@data-e2e="search-card-user-link"]', card);
+        rec.user_href = el ? (el.href || '') : '';
+    }
+
+    el = first('.//div[contains(@class, "DivTimeTag")]', card);
+    if (el) {
+        rec.time_text = text(el);
+    } else {
+        el = first('.//time', card);
+        if (el) rec.time_text = el.getAttribute('datetime') || text(el);
+    }
+
+    for (const sel of likeSelectors) {
+        const t = text(first(sel, card));
+        if (t && t !== '0') { rec.likes = t; rec.engagement_found = true; break; }
+    }
+    el = first('.//strong[@data-e2e="share-count"]', card);
+    if (el) rec.shares = text(el) || '0';
+    el = first('.//strong[@data-e2e="comment-count"]', card);
+    if (el) rec.comments = text(el) || '0';
+
+    records.push(rec);
+}
+return records;
+"""
+
+# Tandai card yang link-nya sudah diterima Python (card yang belum ter-hydrate atau
+# gagal validasi tetap diekstrak ulang). hide=true menyembunyikan card lewat CSS:
+# DOM milik React tidak diubah, tinggi card dipertahankan agar posisi scroll dan
+# infinite load tidak berubah, dan browser tidak lagi me-render isinya.
+MARK_CARDS_JS = """
+const containerXpaths = arguments[0], links = new Set(arguments[1]), hide = arguments[2];
+
+let cards = [];
+for (const xpath of containerXpaths) {
+    const snap = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < snap.snapshotLength; i++) cards.push(snap.snapshotItem(i));
+    if (cards.length) break;
+}
+
+let marked = 0;
+for (const card of cards) {
+    if (card.hasAttribute('data-scraped')) continue;
+    const link = document.evaluate('.//a[contains(@href, "/video/")]', card, null,
+                                   XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (!link || !links.has(link.href)) continue;
+    card.setAttribute('data-scraped', '1');
+    if (hide) {
+        card.style.height = card.offsetHeight + 'px';
+        card.style.contain = 'size';
+        card.style.contentVisibility = 'hidden';
+    }
+    marked++;
+}
+return marked;
+"""
+
+def extract_cards_batch(driver, start=0, limit=None, skip_scraped=False):
+    """Ekstrak record mentah semua card yang sudah dimuat dengan satu execute_script"""
+    try:
+        return driver.execute_script(EXTRACT_CARDS_JS, CONTAINER_XPATHS, LIKE_SELECTORS,
+                                     start, limit, skip_scraped) or []
+    except Exception as e:
+        print("Error batch extraction:", e)
+        return []
+
+def mark_scraped_cards(driver, links, hide=False):
+    """Tandai card dengan link yang sudah diekstrak agar dilewati extract_cards_batch(skip_scraped=True)"""
+    if not links:
+        return 0
+    try:
+        return driver.execute_script(MARK_CARDS_JS, CONTAINER_XPATHS, list(links), hide) or 0
+    except Exception as e:
+        print("Error menandai card:", e)
+        return 0
+
+def video_data_from_record(record, driver=None, fetch_likes_from_video_page=False):
+    """Normalisasi record dari EXTRACT_CARDS_JS ke format extract_video_data"""
+    if not record or not record.get("link"):
+        return None
+
+    data = {
+        "title": record.get("title") or "",
+        "description": record.get("description") or "",
+        "link": record["link"],
+        "likes": record.get("likes") or "0",
+        "shares": record.get("shares") or "0",
+        "comments": record.get("comments") or "0",
+        "author": "",
+        "author_username": "",
+        "timestamp": normalize_timestamp(record.get("time_text") or ""),
+        "mentions_in_caption": [],
+        "hashtags": [],
+        "scraped_at": datetime.now(timezone.utc).isoformat()
+    }
+
+    combined_text = " ".join([data["title"], data["description"]]).strip()
+    if combined_text:
+        mentions = MENTION_RE.findall(combined_text)
+        data["mentions_in_caption"] = [f"@{m}" for m in mentions] if mentions else []
+        data["hashtags"] = re.findall(r'#\w+', combined_text)
+
+    uname = record.get("username")
+    if uname is not None:
+        data["author_username"] = uname
+        data["author"] = f"@{uname}" if not uname.startswith('@') else uname
+    else:
+        href = record.get("user_href") or ""
+        if '/@' in href:
+            username = href.split('/@')[1].split('/')[0]
+            data["author_username"] = username
+            data["author"] = f"@{username}"
+
+    if not record.get("engagement_found") and fetch_likes_from_video_page and driver:
+        data["likes"] = fetch_likes_from_page(driver, data["link"]) or data["likes"]
+
+    if data["title"] or data["author"]:
+        return data
+    return None
+
+def compare_extraction_speed(keyword=None, max_videos=100, headless=True):
+    """Bandingkan cards/detik extract_video_data vs batch extraction pada halaman yang sama"""
+    keyword = keyword or CONFIG["keyword_variations"][0]
+    driver = setup_driver(headless=headless)
+
+    try:
+        driver.get(f"https://www.tiktok.com/search?q={keyword.replace(' ', '%20')}")
+        time.sleep(6 + random.uniform(0, 2))
+
+        containers = find_video_containers(driver)
+        for _ in range(20):
+            if len(containers) >= max_videos:
+                break
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            time.sleep(random.uniform(2.0, 3.5))
+            containers = find_video_containers(driver)
+        containers = containers[:max_videos]
+        if not containers:
+            print("Tidak ada card untuk dibandingkan")
+            return None
+
+        start = time.perf_counter()
+        per_card = [extract_video_data(c) for c in containers]
+        per_card_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = [video_data_from_record(r) for r in extract_cards_batch(driver, limit=len(containers))]
+        batch_seconds = time.perf_counter() - start
+
+        # Timestamp relatif dihitung ulang dari "sekarang", bandingkan sampai menit
+        def comparable(video):
+            if not video:
+                return None
+            row = {k: v for k, v in video.items() if k != "scraped_at"}
+            row["timestamp"] = row["timestamp"][:16]
+            return row
+
+        matching = sum(comparable(a) == comparable(b) for a, b in zip(per_card, batch))
+        cards = len(containers)
+        per_card_rate = cards / per_card_seconds if per_card_seconds else float("inf")
+        batch_rate = cards / batch_seconds if batch_seconds else float("inf")
+
+        print(f"\nPerbandingan ekstraksi ({cards} cards, keyword '{keyword}'):")
+        print(f"   • extract_video_data : {per_card_seconds:.2f}s ({per_card_rate:.1f} cards/detik)")
+        print(f"   • batch execute_script: {batch_seconds:.2f}s ({batch_rate:.1f} cards/detik)")
+        if batch_seconds:
+            print(f"   • Speedup: {per_card_seconds / batch_seconds:.1f}x")
+        print(f"   • Record identik: {matching}/{cards}")
+
+        return {
+            "cards": cards,
+            "per_card_seconds": per_card_seconds,
+            "batch_seconds": batch_seconds,
+            "matching": matching,
+        }
+
+    except Exception as e:
+        print("Error compare extraction:", e)
+        return None
+    finally:
+        driver.quit()
+
+# ------------------------------
+# Engagement enrichment (video page, tab pool)
+# ------------------------------
+VIDEO_ID_RE = re.compile(r'/video/(\d+)')
+
+# Ambil stats dari halaman video: data rehydration JSON lebih dulu, lalu DOM.
+# Mengembalikan null selama halaman video yang dimaksud belum siap (kecuali final=true).
+VIDEO_STATS_JS = """
+const videoId = arguments[0], final = arguments[1];
+if (videoId && location.href.indexOf(videoId) === -1) return null;
+
+function clean(value) {
+    return value == null ? null : String(value).trim();
+}
+function text(selector) {
+    const el = document.querySelector(selector);
+    return el ? ((el.innerText || '').trim() || null) : null;
+}
+
+let stats = null;
+try {
+    const el = document.getElementById('__UNIVERSAL_DATA_FOR_REHYDRATION__');
+    if (el) {
+        const scope = JSON.parse(el.textContent).__DEFAULT_SCOPE__ || {};
+        const detail = scope['webapp.video-detail'];
+        const item = detail && detail.itemInfo && detail.itemInfo.itemStruct;
+        if (item && (!videoId || item.id === videoId)) stats = item.stats;
+    }
+    if (!stats && window.SIGI_STATE && window.SIGI_STATE.ItemModule) {
+        const item = window.SIGI_STATE.ItemModule[videoId];
+        stats = item ? item.stats : null;
+    }
+} catch (e) {
+    stats = null;
+}
+if (stats) {
+    return {likes: clean(stats.diggCount), comments: clean(stats.commentCount),
+            shares: clean(stats.shareCount), views: clean(stats.playCount)};
+}
+
+const likes = text('[data-e2e="like-count"]') || text('[data-e2e="browse-like-count"]');
+if (!likes && !final) return null;
+return {likes: likes,
+        comments: text('[data-e2e="comment-count"]') || text('[data-e2e="browse-comment-count"]'),
+        shares: text('[data-e2e="share-count"]'),
+        views: null};
+"""
+
+class DomainThrottle:
+    """Politeness per domain: batas request bersamaan dan jeda minimum antar request"""
+
+    def __init__(self, max_in_flight=2, min_interval=1.0):
+        self.max_in_flight = max(1, max_in_flight)
+        self.min_interval = min_interval
+        self.in_flight = {}
+        self.last_start = {}
+
+    def acquire(self, url):
+        """True jika request ke domain url boleh dimulai sekarang (non-blocking)"""
+        domain = urlparse(url).netloc
+        now = time.monotonic()
+        if self.in_flight.get(domain, 0) >= self.max_in_flight:
+            return False
+        if now - self.last_start.get(domain, float("-inf")) < self.min_interval:
+            return False
+        self.in_flight[domain] = self.in_flight.get(domain, 0) + 1
+        self.last_start[domain] = now
+        return True
+
+    def release(self, url):
+        domain = urlparse(url).netloc
+        self.in_flight[domain] = max(0, self.in_flight.get(domain, 0) - 1)
+
+def lacks_engagement(video):
+    """Video tanpa likes dari search card perlu diambil dari halaman video"""
+    return str(video.get("likes", "0")).strip() in ("", "0")
+
+def enrich_engagement(driver, videos, concurrency=4, per_domain=2, min_interval=1.0, timeout=15.0,
+                      network_stats=None):
+    """
+    Ambil likes, comments, shares dan views dari halaman video secara bersamaan.
+
+    Hanya video tanpa engagement yang diproses. Sebanyak `concurrency` tab
+    dibuka; tiap tab dinavigasi tanpa menunggu load, lalu semua tab di-poll
+    bergiliran sampai stats tersedia atau timeout. DomainThrottle membatasi
+    request per domain; karena semua link ada di tiktok.com, per_domain di
+    bawah concurrency yang benar-benar membatasi beban ke server. Nilai
+    ditulis langsung ke dict video.
+    """
+    pending = [v for v in videos if v.get("link") and lacks_engagement(v)]
+    if not pending:
+        return 0
+
+    throttle = DomainThrottle(max_in_flight=per_domain, min_interval=min_interval)
+    original_handle = driver.current_window_handle
+    slots = []
+    enriched = 0
+    started_at = time.perf_counter()
+    total = len(pending)
+    pending.reverse()
+
+    try:
+        for _ in range(min(max(1, concurrency), total)):
+            handle = open_blocked_tab(driver, CONFIG["blocking_profile"])
+            slots.append({"handle": handle, "video": None, "started": 0.0})
+
+        while pending or any(slot["video"] for slot in slots):
+            for slot in slots:
+                video = slot["video"]
+
+                if video is None:
+                    if pending and throttle.acquire(pending[-1]["link"]):
+                        video = pending.pop()
+                        driver.switch_to.window(slot["handle"])
+                        if network_stats:
+                            network_stats.collect(driver)
+                        driver.execute_script("window.location.href = arguments[0];", video["link"])
+                        slot.update(video=video, started=time.monotonic())
+                    continue
+
+                match = VIDEO_ID_RE.search(video["link"])
+                timed_out = time.monotonic() - slot["started"] > timeout
+                try:
+                    driver.switch_to.window(slot["handle"])
+                    stats = driver.execute_script(VIDEO_STATS_JS, match.group(1) if match else "", timed_out)
+                except Exception:
+                    stats = None
+                if stats is None and not timed_out:
+                    continue
+
+                if stats:
+                    updated = False
+                    for metric in ["likes", "comments", "shares", "views"]:
+                        value = stats.get(metric)
+                        if value:
+                            video[metric] = value
+                            updated = True
+                    enriched += updated
+
+                throttle.release(video["link"])
+                slot["video"] = None
+
+            time.sleep(0.25)
+
+    except Exception as e:
+        print("Error enrichment engagement:", e)
+    finally:
+        for slot in slots:
+            try:
+                driver.switch_to.window(slot["handle"])
+                if network_stats:
+                    network_stats.collect(driver)
+                driver.close()
+            except Exception:
+                pass
+        try:
+            driver.switch_to.window(original_handle)
+        except Exception:
+            pass
+
+    elapsed = time.perf_counter() - started_at
+    rate = total / elapsed if elapsed else 0.0
+    print(f"  Enrichment engagement: {enriched}/{total} video dalam {elapsed:.1f}s "
+          f"({rate:.2f} video/detik, {len(slots)} tab)")
+    return enriched
+
 # ------------------------------
 # Fungsi untuk intelligent update
 # ------------------------------
@@ -403,7 +850,7 @@ def compare_and_update_video_data(existing_df, new_df):
     new_df = safe_datetime_conversion(new_df, 'scraped_at')
     
     # Convert metrics ke numeric untuk perbandingan
-    metric_columns = ['likes', 'shares', 'comments']
+    metric_columns = ['likes', 'shares', 'comments', 'views']
     for col in metric_columns:
         if col in existing_df.columns:
             existing_df[col] = pd.to_numeric(existing_df[col], errors='coerce').fillna(0)
@@ -509,7 +956,7 @@ def monitor_engagement_changes(filename):
         df = pd.read_csv(filename, encoding='utf-8-sig')
         
         # Convert metrics ke numeric
-        metric_columns = ['likes', 'shares', 'comments']
+        metric_columns = ['likes', 'shares', 'comments', 'views']
         for col in metric_columns:
             if col in df.columns:
                 df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
@@ -725,10 +1172,30 @@ def analyze_hashtag_network(filename):
 # ------------------------------
 # Scrape main flow (search)
 # ------------------------------
-def scrape_tiktok_search(keyword, max_videos=1000, headless=True, fetch_likes_from_video_page=False):
-    driver = setup_driver(headless=headless)
+def scrape_tiktok_search(keyword, max_videos=1000, headless=True, fetch_likes_from_video_page=False,
+                         batch_extract=False, incremental=False, on_video=None, detach_cards=False,
+                         enrich_concurrency=0, enrich_per_domain=2, enrich_min_interval=1.0,
+                         driver_pool=None):
+    """
+    Scrape hasil search TikTok.
+
+    incremental=True mengekstrak card baru setelah setiap scroll (selalu lewat
+    batch extraction) dan memanggil on_video(video, relations) segera setelah
+    record diparse, misalnya queue.put atau writer. detach_cards=True
+    menyembunyikan card yang sudah diekstrak (CSS content-visibility) agar
+    browser tidak lagi me-render-nya.
+
+    Dengan fetch_likes_from_video_page dan enrich_concurrency > 0, engagement
+    diambil oleh enrich_engagement per kelompok video, bukan satu per satu
+    di dalam ekstraksi card.
+
+    Dengan driver_pool browser dipinjam dari pool dan dikembalikan setelah
+    selesai, bukan dibuat dan di-quit setiap run.
+    """
+    driver = driver_pool.acquire() if driver_pool else setup_driver(headless=headless)
     results = []
     sna_relations = []
+    network_stats = NetworkStats(CONFIG["blocking_profile"]) if CONFIG["network_stats"] else None
 
     try:
         base_url = f"https://www.tiktok.com/search?q={keyword.replace(' ', '%20')}"
@@ -743,56 +1210,112 @@ def scrape_tiktok_search(keyword, max_videos=1000, headless=True, fetch_likes_fr
         print(f"Mulai scraping untuk keyword: '{keyword}'")
         print(f"Target: {max_videos} video")
 
-        while True:
-            containers = driver.find_elements(By.XPATH, '//div[contains(@class, "DivItemContainerForSearch")]') \
-                         or driver.find_elements(By.XPATH, '//div[contains(@class, "DivItemContainer")]') \
-                         or driver.find_elements(By.XPATH, '//div[contains(@class, "video-feed-item")]')
+        # Enrichment paralel menggantikan fetch per card
+        enrich = fetch_likes_from_video_page and enrich_concurrency > 0
+        fetch_per_card = fetch_likes_from_video_page and not enrich
 
-            if len(containers) >= max_videos:
-                print(f"Target tercapai: {len(containers)} containers ditemukan")
-                break
+        def collect(videos):
+            """Simpan video unik (sampai max_videos) beserta relasi SNA-nya, return jumlah diterima"""
+            accepted = []
+            for video in videos:
+                if len(results) + len(accepted) >= max_videos:
+                    break
+                if not video or video["link"] in seen_links:
+                    continue
+                seen_links.add(video["link"])
+                accepted.append(video)
+
+            if enrich:
+                enrich_engagement(driver, accepted, concurrency=enrich_concurrency,
+                                  per_domain=enrich_per_domain, min_interval=enrich_min_interval,
+                                  network_stats=network_stats)
+
+            for video in accepted:
+                results.append(video)
 
-            if len(containers) == last_count:
-                consecutive_empty_scrolls += 1
-                if consecutive_empty_scrolls >= max_empty_scrolls:
-                    print(f"Berhenti scroll: tidak ada konten baru setelah {consecutive_empty_scrolls} attempts")
+                # Ekstrak relasi SNA
+                video_relations = extract_sna_relations(video)
+                sna_relations.extend(video_relations)
+
+                if on_video:
+                    on_video(video, video_relations)
+
+                if len(results) % 25 == 0:
+                    print(f"  Progress: {len(results)}/{max_videos} video, {len(sna_relations)} relasi SNA")
+            return len(accepted)
+
+        if incremental:
+            # Ekstrak card yang baru muncul setelah setiap scroll
+            while len(results) < max_videos:
+                records = extract_cards_batch(driver, limit=max_videos - len(results), skip_scraped=True)
+                videos = [video_data_from_record(r, driver=driver, fetch_likes_from_video_page=fetch_per_card)
+                          for r in records]
+                new_videos = collect(videos)
+                # Hanya card yang menghasilkan video valid yang ditandai
+                mark_scraped_cards(driver, [video["link"] for video in videos if video], hide=detach_cards)
+
+                if new_videos:
+                    consecutive_empty_scrolls = 0
+                else:
+                    consecutive_empty_scrolls += 1
+                    if consecutive_empty_scrolls >= max_empty_scrolls:
+                        print(f"Berhenti scroll: tidak ada konten baru setelah {consecutive_empty_scrolls} attempts")
+                        break
+
+                if len(results) >= max_videos:
+                    print(f"Target tercapai: {len(results)} video")
                     break
-            else:
-                consecutive_empty_scrolls = 0
 
-            last_count = len(containers)
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(random.uniform(2.0, 3.5))
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                time.sleep(random.uniform(2.0, 3.5))
 
-        print(f"Total video yang akan diproses: {len(containers)} (target {max_videos})")
+        else:
+            while True:
+                containers = find_video_containers(driver)
 
-        count = 0
-        for container in containers:
-            if count >= max_videos:
-                break
-            video = extract_video_data(container, driver=driver, fetch_likes_from_video_page=fetch_likes_from_video_page)
-            if not video:
-                continue
-            if video["link"] in seen_links:
-                continue
+                if len(containers) >= max_videos:
+                    print(f"Target tercapai: {len(containers)} containers ditemukan")
+                    break
+
+                if len(containers) == last_count:
+                    consecutive_empty_scrolls += 1
+                    if consecutive_empty_scrolls >= max_empty_scrolls:
+                        print(f"Berhenti scroll: tidak ada konten baru setelah {consecutive_empty_scrolls} attempts")
+                        break
+                else:
+                    consecutive_empty_scrolls = 0
+
+                last_count = len(containers)
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                time.sleep(random.uniform(2.0, 3.5))
 
-            seen_links.add(video["link"])
-            results.append(video)
-            count += 1
+            print(f"Total video yang akan diproses: {len(containers)} (target {max_videos})")
 
-            # Ekstrak relasi SNA
-            video_relations = extract_sna_relations(video)
-            sna_relations.extend(video_relations)
+            if batch_extract:
+                # Satu execute_script untuk semua card, Python hanya normalisasi
+                records = extract_cards_batch(driver)
+                videos = (video_data_from_record(r, driver=driver, fetch_likes_from_video_page=fetch_per_card)
+                          for r in records)
+            else:
+                videos = (extract_video_data(c, driver=driver, fetch_likes_from_video_page=fetch_per_card)
+                          for c in containers)
 
-            if count % 25 == 0:
-                print(f"  Progress: {count}/{max_videos} video, {len(sna_relations)} relasi SNA")
+            collect(videos)
 
         print(f"Scraping selesai. Dapat {len(results)} video dan {len(sna_relations)} relasi SNA.")
 
     except Exception as e:
         print("Error main scrape:", e)
     finally:
-        driver.quit()
+        if network_stats:
+            network_stats.collect(driver)
+            print(network_stats.summary())
+            save_network_stats(network_stats, CONFIG["network_stats_filename"],
+                               keyword=keyword, videos=len(results))
+        if driver_pool:
+            driver_pool.release(driver)
+        else:
+            driver.quit()
 
     return results, sna_relations
 
@@ -902,6 +1425,27 @@ def get_next_keyword():
     CONFIG["current_keyword_index"] = (current_idx + 1) % len(keywords)
     return keyword
 
+DRIVER_POOL = None
+
+def get_driver_pool():
+    """Pool browser yang dipakai ulang oleh setiap run scheduler"""
+    global DRIVER_POOL
+    if DRIVER_POOL is None:
+        DRIVER_POOL = DriverPool(
+            lambda: setup_driver(headless=CONFIG["headless"]),
+            size=CONFIG["driver_pool_size"],
+            max_uses=CONFIG["driver_max_uses"],
+            max_memory_mb=CONFIG["driver_max_memory_mb"],
+            name="TikTok"
+        )
+        atexit.register(DRIVER_POOL.close_all)
+        # Browser dibuat saat scheduler start, bukan saat run pertama
+        try:
+            DRIVER_POOL.warm()
+        except Exception as e:
+            print(f"Warning: gagal menyiapkan browser pool: {e}")
+    return DRIVER_POOL
+
 def automated_scraping_improved():
     """Fungsi scraping otomatis dengan intelligent update"""
     # Gunakan keyword yang berbeda setiap run
@@ -915,7 +1459,14 @@ def automated_scraping_improved():
         keyword=current_keyword,
         max_videos=CONFIG["max_videos"],
         headless=CONFIG["headless"],
-        fetch_likes_from_video_page=CONFIG["fetch_likes_from_video_page"]
+        fetch_likes_from_video_page=CONFIG["fetch_likes_from_video_page"],
+        batch_extract=CONFIG["batch_extract"],
+        incremental=CONFIG["incremental_extract"],
+        detach_cards=CONFIG["detach_extracted_cards"],
+        enrich_concurrency=CONFIG["enrich_concurrency"],
+        enrich_per_domain=CONFIG["enrich_per_domain"],
+        enrich_min_interval=CONFIG["enrich_min_interval"],
+        driver_pool=get_driver_pool() if CONFIG["reuse_driver"] else None
     )
     
     if videos:
@@ -957,6 +1508,8 @@ def main():
     print(f"     - Videos: {CONFIG['csv_filename']}")
     print(f"     - SNA Relations: {CONFIG['sna_filename']}")
     print(f"   • Mode headless: {'Ya' if CONFIG['headless'] else 'Tidak'}")
+    print(f"   • Driver pool: {'Ya (' + str(CONFIG['driver_pool_size']) + ' browser)' if CONFIG['reuse_driver'] else 'Tidak'}")
+    print(f"   • Profil blocking resource: {CONFIG['blocking_profile']}")
     print("=" * 70)
     print("Fitur SNA (Social Network Analysis) + HASHTAG:")
     print("   • Mentioned_in_video: @user1 menyebut @user2 dalam video")
@@ -974,6 +1527,10 @@ def main():
     print("   • Support relative time: '2 jam lalu' → ISO timestamp")
     print("=" * 70)
     
+    # Siapkan browser pool sebelum run pertama
+    if CONFIG["reuse_driver"]:
+        get_driver_pool()
+
     # Jalankan scraping pertama kali
     print("Menjalankan scraping pertama kali...")
     automated_scraping_improved()
@@ -994,6 +1551,8 @@ def main():
             time.sleep(30)  # Check setiap 30 detik
     except KeyboardInterrupt:
         print("\n\nScraper dihentikan oleh user.")
+        if DRIVER_POOL is not None:
+            DRIVER_POOL.close_all()
         print(f"Data video tersimpan di: {CONFIG['csv_filename']}")
         print(f"Data SNA relations tersimpan di: {CONFIG['sna_filename']}")
         
@@ -1026,4 +1585,9 @@ def main():
                 print(f"   Warning: Tidak dapat menganalisis trend: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "--compare-extraction":
+        # python tiktok.py --compare-extraction [jumlah_card]
+        compare_extraction_speed(max_videos=int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+                                 headless=CONFIG["headless"])
+    else:
+        main()
\ No newline at end of file
@@ -5,8 +5,11 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_pool import DriverPool, chromedriver_path
+from resource_blocking import (NetworkStats, apply_blocking_profile, blocking_prefs, enable_network_log,
+                               save_network_stats)
 import pandas as pd
+import atexit
 import time
 import random
 import re
@@ -49,7 +52,15 @@ CONFIG = {
         "koalisi pemerintah",
         "oposisi indonesia"
     ],
-    "current_query_index": 0
+    "current_query_index": 0,
+    "reuse_driver": True,  # Simpan browser (dan sesi login) di antara run scheduler
+    "driver_pool_size": 1,
+    "driver_max_uses": 20,  # Daur ulang browser setelah N run
+    "driver_max_memory_mb": 1500,  # ... atau jika memorinya melewati batas ini
+    "login_check_ttl_minutes": 30,  # Sesi login pool dipakai tanpa cek ulang ke twitter.com selama ini
+    "blocking_profile": "light",  # off / light / aggressive (lihat resource_blocking.py)
+    "network_stats": False,  # Aktifkan performance log chromedriver untuk statistik network per run
+    "network_stats_filename": "twitter_network_stats.csv"
 }
 
 # ======== SETUP DRIVER ========
@@ -111,7 +122,10 @@ def setup_twitter_driver(headless=True):
             "notifications": 2
         }
     }
+    prefs.update(blocking_prefs(CONFIG["blocking_profile"]))
     options.add_experimental_option("prefs", prefs)
+    if CONFIG["network_stats"]:
+        enable_network_log(options)
 
     user_agents = [
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -120,12 +134,13 @@ def setup_twitter_driver(headless=True):
     ]
     options.add_argument(f"--user-agent={random.choice(user_agents)}")
 
-    service = Service(ChromeDriverManager().install())
+    service = Service(chromedriver_path())
     
     # TAMBAHAN: Suppress service logs juga
     service.creation_flags = 0x08000000  # CREATE_NO_WINDOW flag untuk Windows
     
     driver = webdriver.Chrome(service=service, options=options)
+    apply_blocking_profile(driver, CONFIG["blocking_profile"])
 
     # Hapus properti webdriver untuk anti-bot
     driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
@@ -189,6 +204,24 @@ def login_to_twitter(driver, email_or_username, password, actual_username=None):
         print(f"❌ Error saat login: {e}")
         return False
 
+def twitter_session_active(driver, session):
+    """Cek apakah browser masih login: cookie auth_token Twitter/X masih ada"""
+    try:
+        # Cookie hanya terbaca dari halaman di domain yang sama, cek halaman saat ini dulu
+        if driver.get_cookie("auth_token") is not None:
+            return True
+        # Browser pool ada di about:blank: login yang belum melewati TTL dipercaya tanpa navigasi
+        if time.time() - session.get("logged_in_at", 0) < CONFIG["login_check_ttl_minutes"] * 60:
+            return True
+        driver.get("https://twitter.com")
+        time.sleep(3)
+        if driver.get_cookie("auth_token") is None:
+            return False
+        session["logged_in_at"] = time.time()
+        return True
+    except Exception:
+        return False
+
 # ======== FUNGSI SNA - EKSTRAK RELASI (MODIFIED WITH HASHTAG) ========
 def extract_sna_relations(tweet_data):
     """Ekstrak relasi social network dari tweet data termasuk hashtag relations"""
@@ -515,14 +548,26 @@ def extract_tweet_data(tweet_element):
         return None
 
 # ======== SCRAPER (MODIFIED) ========
-def scrape_twitter_search(query, max_tweets=50, use_login=False, email_or_username="", password="", actual_username=None, since_id=None):
-    driver = setup_twitter_driver(headless=True)  # Ubah ke True untuk headless
+def scrape_twitter_search(query, max_tweets=50, use_login=False, email_or_username="", password="", actual_username=None, since_id=None, driver_pool=None):
+    # Dengan driver_pool browser (beserta sesi login) dipinjam dan dikembalikan, bukan di-quit
+    driver = driver_pool.acquire() if driver_pool else setup_twitter_driver(headless=True)  # Ubah ke True untuk headless
+    session = driver_pool.meta(driver) if driver_pool else {}
     tweets_data = []
     sna_relations = []  # List untuk menyimpan relasi SNA
+    # Dikumpulkan sebelum setiap navigasi (hanya jika network_stats aktif)
+    network_stats = NetworkStats(CONFIG["blocking_profile"]) if CONFIG["network_stats"] else None
     
     try:
-        if use_login:
-            if not login_to_twitter(driver, email_or_username, password, actual_username):
+        if use_login and session.get("logged_in") and twitter_session_active(driver, session):
+            print("🔐 Memakai sesi login dari browser pool")
+        elif use_login:
+            session.pop("logged_in_at", None)
+            if session.pop("logged_in", False):
+                print("⚠️ Sesi login di browser pool sudah berakhir → login ulang")
+            if login_to_twitter(driver, email_or_username, password, actual_username):
+                session["logged_in"] = True
+                session["logged_in_at"] = time.time()
+            else:
                 print("⚠️ Login gagal → lanjut tanpa login")
         else:
             driver.get("https://twitter.com")
@@ -540,6 +585,8 @@ def scrape_twitter_search(query, max_tweets=50, use_login=False, email_or_userna
                 break
                 
             print(f"🔍 Strategi {strategy_idx + 1}/3: {['Latest', 'Tanpa replies', 'Min 1 like'][strategy_idx]}")
+            if network_stats:
+                network_stats.collect(driver)
             driver.get(search_url)
             time.sleep(5)
 
@@ -615,6 +662,8 @@ def scrape_twitter_search(query, max_tweets=50, use_login=False, email_or_userna
                 # Refresh strategy
                 if scroll_attempts % 50 == 0:
                     print(f"   🔄 Refresh untuk konten baru (scroll {scroll_attempts})")
+                    if network_stats:
+                        network_stats.collect(driver)
                     driver.refresh()
                     time.sleep(3)
             
@@ -633,7 +682,15 @@ def scrape_twitter_search(query, max_tweets=50, use_login=False, email_or_userna
     except Exception as e:
         print(f"❌ Error scraping: {e}")
     finally:
-        driver.quit()
+        if network_stats:
+            network_stats.collect(driver)
+            print(f"🌐 {network_stats.summary()}")
+            save_network_stats(network_stats, CONFIG["network_stats_filename"],
+                               query=query, tweets=len(tweets_data))
+        if driver_pool:
+            driver_pool.release(driver)
+        else:
+            driver.quit()
 
     return tweets_data, sna_relations
 # ======== FUNGSI UNTUK MENANGANI UPDATE DATA ENGAGEMENT ========
@@ -941,6 +998,27 @@ def get_next_query():
     CONFIG["current_query_index"] = (current_idx + 1) % len(queries)
     return query
 
+DRIVER_POOL = None
+
+def get_driver_pool():
+    """Pool browser yang dipakai ulang oleh setiap run scheduler"""
+    global DRIVER_POOL
+    if DRIVER_POOL is None:
+        DRIVER_POOL = DriverPool(
+            lambda: setup_twitter_driver(headless=True),
+            size=CONFIG["driver_pool_size"],
+            max_uses=CONFIG["driver_max_uses"],
+            max_memory_mb=CONFIG["driver_max_memory_mb"],
+            name="Twitter"
+        )
+        atexit.register(DRIVER_POOL.close_all)
+        # Browser dibuat saat scheduler start, bukan saat run pertama
+        try:
+            DRIVER_POOL.warm()
+        except Exception as e:
+            print(f"⚠️ Gagal menyiapkan browser pool: {e}")
+    return DRIVER_POOL
+
 # ======== MODIFIED AUTOMATED SCRAPING FUNCTION ========
 def automated_scraping_improved():
     """
@@ -965,7 +1043,8 @@ def automated_scraping_improved():
         email_or_username=CONFIG["email_or_username"],
         password=CONFIG["password"],
         actual_username=CONFIG["actual_username"],
-        since_id=last_tweet_id
+        since_id=last_tweet_id,
+        driver_pool=get_driver_pool() if CONFIG["reuse_driver"] else None
     )
     
     if tweets:
@@ -1010,6 +1089,8 @@ def main():
     print(f"     - Tweets: {CONFIG['csv_filename']}")
     print(f"     - SNA Relations: {CONFIG['sna_filename']}")
     print(f"   • Login: {'Ya' if CONFIG['use_login'] else 'Tidak'}")
+    print(f"   • Driver pool: {'Ya (' + str(CONFIG['driver_pool_size']) + ' browser)' if CONFIG['reuse_driver'] else 'Tidak'}")
+    print(f"   • Profil blocking resource: {CONFIG['blocking_profile']}")
     print("=" * 70)
     print("🔗 Fitur SNA (Social Network Analysis) + HASHTAG:")
     print("   • Mention: @user1 menyebut @user2")
@@ -1019,6 +1100,10 @@ def main():
     print("   • Hashtag_use: @user1 menggunakan #hashtag")
     print("=" * 70)
     
+    # Siapkan browser pool sebelum run pertama
+    if CONFIG["reuse_driver"]:
+        get_driver_pool()
+
     # Jalankan scraping pertama kali
     print("🔥 Menjalankan scraping pertama kali...")
     automated_scraping_improved()
@@ -1037,6 +1122,8 @@ def main():
             time.sleep(30)  # Check setiap 30 detik
     except KeyboardInterrupt:
         print("\n\n🛑 Scraper dihentikan oleh user.")
+        if DRIVER_POOL is not None:
+            DRIVER_POOL.close_all()
         print(f"📁 Data tweets tersimpan di: {CONFIG['csv_filename']}")
         print(f"📁 Data SNA relations tersimpan di: {CONFIG['sna_filename']}")
         